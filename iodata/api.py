@@ -20,17 +20,21 @@
 
 
 import os
-from typing import Iterator
+from itertools import islice
+from typing import Callable, Iterator, Union, Sequence
 from types import ModuleType
 from fnmatch import fnmatch
 from pkgutil import iter_modules
 from importlib import import_module
 
+import numpy as np
+
 from .iodata import IOData
-from .utils import LineIterator
+from .utils import LineIterator, fingerprint, load_sidecar, dump_sidecar
 
 
-__all__ = ['load_one', 'load_many', 'dump_one', 'dump_many', 'write_input']
+__all__ = ['load_one', 'load_many', 'index_many', 'load_frames', 'dump_one', 'dump_many',
+           'write_input']
 
 
 def _find_format_modules():
@@ -73,7 +77,9 @@ def _select_format_module(filename: str, attrname: str, fmt: str = None) -> Modu
                 if hasattr(format_module, attrname):
                     return format_module
     else:
-        return FORMAT_MODULES[fmt]
+        format_module = FORMAT_MODULES[fmt]
+        if hasattr(format_module, attrname):
+            return format_module
     raise ValueError('Could not find file format with feature {} for file {}'.format(
         attrname, filename))
 
@@ -145,7 +151,8 @@ def load_one(filename: str, fmt: str = None, **kwargs) -> IOData:
     return iodata
 
 
-def load_many(filename: str, fmt: str = None, **kwargs) -> Iterator[IOData]:
+def load_many(filename: str, fmt: str = None, start: int = 0, stop: int = None,
+              step: int = 1, **kwargs) -> Iterator[IOData]:
     """Load multiple IOData instances from a file.
 
     This function uses the extension or prefix of the filename to determine the
@@ -159,6 +166,11 @@ def load_many(filename: str, fmt: str = None, **kwargs) -> Iterator[IOData]:
     fmt
         The name of the file format module to use. When not given, it is guessed
         from the filename.
+    start, stop, step
+        Only load the frames selected by ``range(start, stop, step)``, where
+        ``stop=None`` means until the end of the file. Formats with a
+        ``skip_one`` function (e.g. XYZ, EXTXYZ, GRO and SDF) pass over the other
+        frames without parsing them.
     **kwargs
         Keyword arguments are passed on to the format-specific load_many function.
 
@@ -168,15 +180,129 @@ def load_many(filename: str, fmt: str = None, **kwargs) -> Iterator[IOData]:
         An instance of IOData with data for one frame loaded for the file.
 
     """
+    if start < 0 or (stop is not None and stop < 0) or step < 1:
+        raise ValueError("Frame selection requires start >= 0, stop >= 0 and step >= 1.")
     format_module = _select_format_module(filename, 'load_many', fmt)
     lit = LineIterator(filename)
-    for data in format_module.load_many(lit, **kwargs):
+    datas = format_module.load_many(lit, **kwargs)
+    if hasattr(format_module, 'skip_one'):
+        datas = _skip_frames(lit, datas, format_module.skip_one, start, stop, step)
+    elif (start, stop, step) != (0, None, 1):
+        datas = islice(datas, start, stop, step)
+    for data in datas:
         try:
             yield IOData(**data)
         except StopIteration:
             return
 
 
+def _skip_frames(lit: LineIterator, datas: Iterator[dict], skip_one: Callable,
+                 start: int, stop: int, step: int) -> Iterator[dict]:
+    """Select frames from load_many, skipping the other ones with skip_one.
+
+    The ``load_many`` generator only reads from ``lit`` when the next frame is
+    requested, such that frames can be skipped in between.
+    """
+    iframe = 0
+    selected = start
+    while stop is None or selected < stop:
+        try:
+            while iframe < selected:
+                skip_one(lit)
+                iframe += 1
+            data = next(datas)
+        except StopIteration:
+            return
+        yield data
+        iframe += 1
+        selected += step
+
+
+def index_many(filename: str, fmt: str = None, persist: bool = False) -> np.ndarray:
+    """Locate the frames in a trajectory file, for random access with ``load_frames``.
+
+    The file is scanned once without parsing the frames. When ``persist`` is
+    set, the result is saved next to the file, with the suffix ``.index.json``,
+    and reused as long as the size and modification time of the file do not
+    change.
+
+    Parameters
+    ----------
+    filename
+        The trajectory file.
+    fmt
+        The name of the file format module to use. When not given, it is guessed
+        from the filename.
+    persist
+        When set, the index is loaded from or saved to a file when possible.
+
+    Returns
+    -------
+    index
+        An integer array with shape ``(nframe, 2)``. Each row contains the byte
+        offset of a frame and the number of lines preceding it.
+
+    """
+    format_module = _select_format_module(filename, 'index_many', fmt)
+    key = {'format': format_module.__name__.rpartition('.')[2]}
+    if persist:
+        index = load_sidecar(filename, key)
+        if index is not None:
+            try:
+                return np.array(index, dtype=np.int64).reshape(-1, 2)
+            except (TypeError, ValueError):
+                # The sidecar is valid JSON but does not contain an index.
+                pass
+    file_fingerprint = fingerprint(filename)
+    lit = LineIterator(filename)
+    index = np.array(list(format_module.index_many(lit)), dtype=np.int64).reshape(-1, 2)
+    if persist:
+        dump_sidecar(filename, key, file_fingerprint, index.tolist())
+    return index
+
+
+def load_frames(filename: str, frames: Union[int, slice, Sequence[int]], fmt: str = None,
+                index: np.ndarray = None, **kwargs) -> Iterator[IOData]:
+    """Load selected frames from a trajectory file.
+
+    Each frame is read after seeking directly to its location, without parsing
+    the preceding frames.
+
+    Parameters
+    ----------
+    filename
+        The file to load data from.
+    frames
+        The frame to load, a slice of frames or a sequence of frame indexes.
+        Negative indexes count from the end of the file.
+    fmt
+        The name of the file format module to use. When not given, it is guessed
+        from the filename.
+    index
+        The result of ``index_many``. When not given, ``index_many`` is called
+        with default arguments.
+    **kwargs
+        Keyword arguments are passed on to the format-specific load_one function.
+
+    Yields
+    ------
+    out
+        An instance of IOData with data for one selected frame.
+
+    """
+    format_module = _select_format_module(filename, 'index_many', fmt)
+    if index is None:
+        index = index_many(filename, fmt)
+    lit = LineIterator(filename)
+    for offset, lineno in index[frames].reshape(-1, 2):
+        lit.seek(int(offset), int(lineno))
+        try:
+            data = format_module.load_one(lit, **kwargs)
+        except StopIteration:
+            lit.error("File ended before all data was read.")
+        yield IOData(**data)
+
+
 def dump_one(iodata: IOData, filename: str, fmt: str = None, **kwargs):
     """Write data to a file.
 
@@ -103,7 +103,7 @@ def validate_shape(*shape_requirements: tuple):
                 raise ValueError(f"Cannot interpret item in shape_requirements: {item}")
         expected_shape = tuple(expected_shape)
         # Get the actual shape
-        if isinstance(value, np.ndarray):
+        if hasattr(value, 'shape'):
             observed_shape = value.shape
         else:
             observed_shape = (len(value),)
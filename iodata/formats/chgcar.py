@@ -32,7 +32,8 @@ import numpy as np
 
 from ..docstrings import document_load_one
 from ..periodic import sym2num
-from ..utils import angstrom, volume, LineIterator, Cube
+from ..utils import angstrom, volume, LineIterator, Cube, LazyCubeData, cube_region
+from .cube import LAZY_DOC, REGION_DOC
 
 
 __all__ = []
@@ -99,13 +100,100 @@ def _load_vasp_header(lit: LineIterator) -> Tuple[str, np.ndarray, np.ndarray, n
     return title, cellvecs, atnums, atcoords
 
 
-def _load_vasp_grid(lit: LineIterator) -> dict:
+def _load_vasp_grid_data(lit: LineIterator, shape: np.ndarray) -> np.ndarray:
+    """Load the values on a grid from a VASP 5 file.
+
+    Parameters
+    ----------
+    lit
+        The line iterator to read the data from.
+    shape
+        The shape of the grid.
+
+    Returns
+    -------
+    data
+        The values on the grid.
+
+    """
+    # The first index runs fastest in the file, hence the Fortran order.
+    return lit.read_array(np.prod(shape)).reshape(shape, order='F')
+
+
+def _load_vasp_shape(lit: LineIterator) -> np.ndarray:
+    """Find the line with the shape of the next grid in a VASP 5 file.
+
+    Augmentation occupancies are skipped without converting their values. Any
+    other line not consisting of three integers, e.g. atomic magnetic moments,
+    is ignored.
+
+    Parameters
+    ----------
+    lit
+        The line iterator to read the data from.
+
+    Returns
+    -------
+    shape
+        The shape of the grid.
+
+    """
+    for line in lit:
+        words = line.split()
+        if words[:2] == ['augmentation', 'occupancies']:
+            # The last word is the number of occupancies that follow.
+            lit.skip_words(int(words[-1]))
+        elif len(words) == 3 and all(word.isdigit() for word in words):
+            return np.array([int(word) for word in words])
+    raise StopIteration
+
+
+def _load_vasp_cube(lit: LineIterator, cellvecs: np.ndarray, lazy: bool = False,
+                    region: tuple = None) -> Cube:
+    """Load the next grid from a VASP 5 file.
+
+    Parameters
+    ----------
+    lit
+        The line iterator to read the data from.
+    cellvecs
+        The cell vectors, used to define the axes of the grid.
+    lazy
+        When True, the data is not decoded and a LazyCubeData instance is used.
+    region
+        A tuple of slices selecting the part of the grid to be loaded.
+
+    Returns
+    -------
+    cube
+        The grid. The line iterator is positioned after the last value.
+
+    """
+    shape = _load_vasp_shape(lit)
+    origin = np.zeros(3)
+    axes = cellvecs / shape.reshape(-1, 1)
+    if lazy or region is not None:
+        cube_data = LazyCubeData(lit.filename, lit.tell(), lit.lineno, shape, fortran=True)
+        lit.seek(*cube_data.end)
+        if region is not None:
+            origin, axes, region = cube_region(origin, axes, shape, region)
+            cube_data = cube_data[region]
+    else:
+        cube_data = _load_vasp_grid_data(lit, shape)
+    return Cube(origin=origin, axes=axes, data=cube_data)
+
+
+def _load_vasp_grid(lit: LineIterator, lazy: bool = False, region: tuple = None) -> dict:
     """Load grid data file from the VASP 5 file format.
 
     Parameters
     ----------
     lit
         The line iterator to read the data from.
+    lazy
+        When True, the data is not decoded and a LazyCubeData instance is used.
+    region
+        A tuple of slices selecting the part of the grid to be loaded.
 
     Returns
     -------
@@ -114,28 +202,12 @@ def _load_vasp_grid(lit: LineIterator) -> dict:
         ``cellvecs`` & ``cube`` keys and their corresponding values.
 
     """
+    if lazy and region is not None:
+        raise ValueError("The options lazy and region cannot be combined.")
     # Load header
     title, cellvecs, atnums, atcoords = _load_vasp_header(lit)
-
-    # read the shape of the data
-    for line in lit:
-        shape = np.array([int(w) for w in line.split()])
-        if len(shape) == 3:
-            break
-
-    # read data
-    cube_data = np.zeros(shape, float)
-    words = []
-    for i2 in range(shape[2]):
-        for i1 in range(shape[1]):
-            for i0 in range(shape[0]):
-                if not words:
-                    words = next(lit).split()
-                cube_data[i0, i1, i2] = float(words.pop(0))
-
-    cube = Cube(origin=np.zeros(3), axes=cellvecs / shape.reshape(-1, 1),
-                data=cube_data)
-
+    # Load data
+    cube = _load_vasp_cube(lit, cellvecs, lazy, region)
     return {
         'title': title,
         'atcoords': atcoords,
@@ -145,10 +217,29 @@ def _load_vasp_grid(lit: LineIterator) -> dict:
     }
 
 
-@document_load_one("VASP 5 CHGCAR", ['atcoords', 'atnums', 'cellvecs', 'cube', 'title'])
-def load_one(lit: LineIterator) -> dict:
+MAGNETIZATION_DOC = """When True, the magnetization density of a spin-polarized calculation is also
+loaded. It is the second grid in the file, which is stored as a ``Cube`` in
+``extra['magnetization']``. The augmentation occupancies preceding it are skipped
+without converting their values. The options ``lazy`` and ``region`` apply to
+both grids.
+"""
+
+
+@document_load_one("VASP 5 CHGCAR", ['atcoords', 'atnums', 'cellvecs', 'cube', 'title'],
+                   ['extra'], {"lazy": LAZY_DOC, "region": REGION_DOC,
+                               "magnetization": MAGNETIZATION_DOC})
+def load_one(lit: LineIterator, lazy: bool = False, region: tuple = None,
+             magnetization: bool = False) -> dict:
     """Do not edit this docstring. It will be overwritten."""
-    result = _load_vasp_grid(lit)
+    result = _load_vasp_grid(lit, lazy, region)
+    if magnetization:
+        try:
+            result['extra'] = {
+                'magnetization': _load_vasp_cube(lit, result['cellvecs'], lazy, region)}
+        except StopIteration:
+            lit.error("No magnetization density found.")
     # renormalize electron density
-    result['cube'].data[:] /= volume(result['cellvecs'])
+    result['cube'].data /= volume(result['cellvecs'])
+    if magnetization:
+        result['extra']['magnetization'].data /= volume(result['cellvecs'])
     return result
@@ -33,7 +33,7 @@ import numpy as np
 
 from ..iodata import IOData
 from ..docstrings import document_load_one, document_dump_one
-from ..utils import LineIterator, Cube
+from ..utils import LineIterator, Cube, LazyCubeData, cube_region
 
 
 __all__ = []
@@ -109,33 +109,51 @@ def _read_cube_header(lit: LineIterator) \
 def _read_cube_data(lit: LineIterator, cube: Dict[str, np.ndarray]):
     """Load cube data from a CUBE file object.
 
+    All values are converted at once and reshaped to the grid.
+
     Parameters
     ----------
     lit
         The line iterator to read the data from.
-
-    Returns
-    -------
-    out
-        The cube data array.
+    cube
+        A dictionary with the grid ``shape``. The data array is stored in it
+        with key ``data``.
 
     """
-    cube['data'] = np.zeros(tuple(cube['shape']), float)
-    tmp = cube['data'].ravel()
-    counter = 0
-    words = []
-    while counter < tmp.size:
-        if not words:
-            words = next(lit).split()
-        tmp[counter] = float(words.pop(0))
-        counter += 1
-
-
-@document_load_one("Gaussian Cube", ['atcoords', 'atcorenums', 'atnums', 'cellvecs', 'cube'])
-def load_one(lit: LineIterator) -> dict:
+    shape = tuple(cube['shape'])
+    cube['data'] = lit.read_array(np.prod(shape)).reshape(shape)
+
+
+LAZY_DOC = """\
+When True, ``cube.data`` is a :py:class:`iodata.utils.LazyCubeData` instance, which only
+decodes the parts of the grid that are indexed.
+"""
+
+
+REGION_DOC = """\
+A tuple of (at most three) slices, e.g. ``(slice(10, 50), slice(None), slice(0, None, 2))``,
+to load only a sub-box and/or a strided selection of the grid. Rows of the grid outside
+the region are not decoded. ``cube.origin`` and ``cube.axes`` describe the selected
+points, while ``cellvecs`` is not changed. This cannot be combined with ``lazy``.
+"""
+
+
+@document_load_one("Gaussian Cube", ['atcoords', 'atcorenums', 'atnums', 'cellvecs', 'cube'],
+                   [], {"lazy": LAZY_DOC, "region": REGION_DOC})
+def load_one(lit: LineIterator, lazy: bool = False, region: tuple = None) -> dict:
     """Do not edit this docstring. It will be overwritten."""
     title, atcoords, atnums, cellvecs, cube, atcorenums = _read_cube_header(lit)
-    _read_cube_data(lit, cube)
+    if lazy and region is not None:
+        raise ValueError("The options lazy and region cannot be combined.")
+    if lazy:
+        cube['data'] = LazyCubeData(lit.filename, lit.tell(), lit.lineno, cube['shape'])
+    elif region is not None:
+        cube['origin'], cube['axes'], region = cube_region(
+            cube['origin'], cube['axes'], cube['shape'], region)
+        cube['data'] = LazyCubeData(
+            lit.filename, lit.tell(), lit.lineno, cube['shape'])[region]
+    else:
+        _read_cube_data(lit, cube)
     del cube["shape"]
     return {
         'title': title,
@@ -164,18 +182,18 @@ def _write_cube_header(f: TextIO, title: str, atcoords: np.ndarray, atnums: np.n
 
 
 def _write_cube_data(f: TextIO, cube_data: np.ndarray, block_size: int):
-    counter = 0
-    for value in cube_data.flat:
-        f.write(f' {value: 12.5E}')
-        # go to next line after adding 6 values on a line
-        if counter % 6 == 5:
-            f.write('\n')
-        # go to next line after reaching the block_size & reset counter
-        if block_size % 6 != 0 and counter % block_size == block_size - 1:
-            f.write('\n')
-            counter = 0
-            continue
-        counter += 1
+    # Every block of block_size values (along the last axis) is written as lines
+    # of six values, followed by a line break. Multiple blocks are formatted at
+    # once with a single format string.
+    nfull, nrest = divmod(block_size, 6)
+    block_format = (' % 12.5E' * 6 + '\n') * nfull
+    if nrest > 0:
+        block_format += ' % 12.5E' * nrest + '\n'
+    blocks = np.asarray(cube_data).reshape(-1, block_size)
+    nblock_chunk = max(1, 65536 // block_size)
+    for begin in range(0, len(blocks), nblock_chunk):
+        chunk = blocks[begin:begin + nblock_chunk]
+        f.write((block_format * len(chunk)) % tuple(chunk.ravel().tolist()))
 
 
 @document_dump_one("Gaussian Cube", ['atcoords', 'atnums', 'cube'], ['title', 'atcorenums'])
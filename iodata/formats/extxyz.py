@@ -28,16 +28,19 @@ handle an XYZ with different molecules, e.g. a molecular database.
 """
 
 from distutils.util import strtobool
+import re
 import shlex
-from typing import Iterator
+from typing import Iterator, List, Tuple
 
 import numpy as np
 
 from ..docstrings import document_load_one, document_load_many
-from ..periodic import sym2num, num2sym
 from ..utils import angstrom, amu, LineIterator
 
-from .xyz import load_one as load_one_xyz
+from .xyz import (_compile_atom_columns, _load_frame as _load_frame_xyz,
+                  skip_one as skip_one_xyz, index_many as index_many_xyz,
+                  load_atnum_word, load_angstrom_word, dump_atnum_word, dump_angstrom_word,
+                  LOAD_WORD_ARRAYS as LOAD_WORD_ARRAYS_XYZ)
 
 
 __all__ = []
@@ -46,6 +49,23 @@ __all__ = []
 PATTERNS = ['*.extxyz']
 
 
+def load_amu_word(word: str) -> float:
+    """Convert a mass in amu to atomic units."""
+    return float(word) * amu
+
+
+def load_force_word(word: str) -> float:
+    """Convert a force to an energy gradient component."""
+    return -float(word)
+
+
+LOAD_WORD_ARRAYS = {
+    **LOAD_WORD_ARRAYS_XYZ,
+    load_amu_word: (lambda words: np.array(words, dtype=float) * amu),
+    load_force_word: (lambda words: -np.array(words, dtype=float)),
+}
+
+
 def _convert_title_value(value: str):
     """Search for the correct dtype and convert the string."""
     list_of_splits = value.split()
@@ -90,17 +110,14 @@ def _parse_properties(properties: str):
     # pos is assumed to be in angstrom, masses in amu (ase convention)
     # No unit convertion takes place for the other attributes
     atom_column_map = {'pos': ('atcoords', None, (3,), float,
-                               (lambda word: float(word) * angstrom),
-                               (lambda value: "{:15.10f}".format(value / angstrom))),
+                               load_angstrom_word, dump_angstrom_word),
                        'masses': ('atmasses', None, (), float,
-                                  (lambda word: float(word) * amu),
+                                  load_amu_word,
                                   (lambda value: "{:15.10f}".format(value / amu))),
                        'force': ('atgradient', None, (3,), float,
-                                 (lambda word: -float(word)),
+                                 load_force_word,
                                  (lambda value: "{:15.10f}".format(-value)))}
-    atnum_column = ("atnums", None, (), int,
-                    (lambda word: int(word) if word.isdigit() else sym2num[word.title()]),
-                    (lambda atnum: "{:2s}".format(num2sym[atnum])))
+    atnum_column = ("atnums", None, (), int, load_atnum_word, dump_atnum_word)
     splitted_properties = properties.split(':')
     assert len(splitted_properties) % 3 == 0
     # Each property has 3 values: its name, dtype and shape
@@ -126,9 +143,27 @@ def _parse_properties(properties: str):
     return atom_columns
 
 
+# A word in the title line, possibly with quoted parts, e.g. Lattice="1 0 0 0 1 0 0 0 1".
+TITLE_WORD_PATTERN = re.compile(r"""(?:[^\s"'\\]+|"[^"\\]*"|'[^'\\]*')+""")
+QUOTED_PATTERN = re.compile("\"[^\"]*\"|'[^']*'")
+
+
+def _split_title(title: str) -> List[str]:
+    """Split the title line into words, like shlex.split but faster.
+
+    Titles with escape characters or unbalanced quotes are passed on to shlex.
+    """
+    if '"' not in title and "'" not in title and '\\' not in title:
+        return title.split()
+    if '\\' in title or TITLE_WORD_PATTERN.sub('', title).strip() != '':
+        return shlex.split(title)
+    return [QUOTED_PATTERN.sub(lambda match: match.group()[1:-1], word)
+            for word in TITLE_WORD_PATTERN.findall(title)]
+
+
 def _parse_title(title: str):
     """Parse the title in an extended xyz file."""
-    key_value_pairs = shlex.split(title)
+    key_value_pairs = _split_title(title)
     # A dict of predefined iodata atrributes with their names and dtype convertion functions
 
     def load_cellvecs(word):
@@ -136,12 +171,13 @@ def _parse_title(title: str):
     iodata_attrs = {'energy': ('energy', float),
                     'Lattice': ('cellvecs', load_cellvecs),
                     'charge': ('charge', float)}
+    properties = None
     data = {}
     for key_value_pair in key_value_pairs:
         if '=' in key_value_pair:
             key, value = key_value_pair.split('=', 1)
             if key == 'Properties':
-                atom_columns = _parse_properties(value)
+                properties = value
             elif key in iodata_attrs.keys():
                 data[iodata_attrs[key][0]] = iodata_attrs[key][1](value)
             else:
@@ -149,7 +185,7 @@ def _parse_title(title: str):
         else:
             # If no value is given, set it True
             data.setdefault('extra', {})[key_value_pair] = True
-    return atom_columns, data
+    return properties, data
 
 
 @document_load_one("EXTXYZ", ['title'],
@@ -157,13 +193,34 @@ def _parse_title(title: str):
                     'charge', 'energy', 'extra'])
 def load_one(lit: LineIterator) -> dict:
     """Do not edit this docstring. It will be overwritten."""
+    return _load_frame(lit, {})
+
+
+def _load_frame(lit: LineIterator, atom_plans: dict) -> dict:
+    """Load one frame, reusing the column plans of previous frames.
+
+    Parameters
+    ----------
+    lit
+        The line iterator to read the data from.
+    atom_plans
+        A dictionary with the column plans used so far, with the Properties
+        string as key. New plans are added to it.
+
+    """
     atom_line = next(lit)
     title_line = next(lit)
     # parse title
-    atom_columns, title_data = _parse_title(title_line)
+    properties, title_data = _parse_title(title_line)
+    if properties is None:
+        lit.error("The title line does not contain Properties.")
+    atom_plan = atom_plans.get(properties)
+    if atom_plan is None:
+        atom_plan = _compile_atom_columns(_parse_properties(properties), LOAD_WORD_ARRAYS)
+        atom_plans[properties] = atom_plan
     lit.back(title_line)
     lit.back(atom_line)
-    xyz_data = load_one_xyz(lit, atom_columns)
+    xyz_data = _load_frame_xyz(lit, atom_plan)
     # If the extra attribute is present, prevent it from overwriting itself
     if 'extra' in title_data.keys() and 'extra' in xyz_data.keys():
         xyz_data['extra'].update(title_data['extra'])
@@ -177,7 +234,9 @@ def load_one(lit: LineIterator) -> dict:
 def load_many(lit: LineIterator) -> Iterator[dict]:
     """Do not edit this docstring. It will be overwritten."""
     # XYZ Trajectory files are a simple concatenation of individual XYZ files,'
-    # making it trivial to load many frames.
+    # making it trivial to load many frames. In most trajectories, all frames have
+    # the same Properties, such that the column plan is only made once.
+    atom_plans = {}
     while True:
         try:
             # Check for and skip empty lines at the end of file
@@ -185,6 +244,24 @@ def load_many(lit: LineIterator) -> Iterator[dict]:
             if line.strip() == "":
                 return
             lit.back(line)
-            yield load_one(lit)
+            yield _load_frame(lit, atom_plans)
         except StopIteration:
             return
+
+
+def skip_one(lit: LineIterator):
+    """Skip one EXTXYZ frame without parsing it.
+
+    The frames are delimited in the same way as in XYZ files, see
+    :func:`iodata.formats.xyz.skip_one`.
+    """
+    skip_one_xyz(lit)
+
+
+def index_many(lit: LineIterator) -> Iterator[Tuple[int, int]]:
+    """Locate the frames in an EXTXYZ trajectory without parsing them.
+
+    The frames are delimited in the same way as in XYZ files, see
+    :func:`iodata.formats.xyz.index_many`.
+    """
+    return index_many_xyz(lit)
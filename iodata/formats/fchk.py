@@ -19,8 +19,11 @@
 """Gaussian FCHK file format."""
 
 
-from fnmatch import fnmatch
-from typing import List, Tuple, Iterator, TextIO
+from collections.abc import MutableMapping, Mapping
+from fnmatch import translate
+from functools import lru_cache
+import re
+from typing import List, Tuple, Iterator, TextIO, NamedTuple, Callable
 
 import numpy as np
 
@@ -29,7 +32,8 @@ from ..basis import MolecularBasis, Shell, HORTON2_CONVENTIONS, convert_conventi
 from ..docstrings import document_load_one, document_load_many
 from ..docstrings import document_dump_one
 from ..orbitals import MolecularOrbitals
-from ..utils import LineIterator, amu
+from ..utils import (LineIterator, FileFormatError, amu, fingerprint, load_sidecar,
+                     dump_sidecar)
 
 
 __all__ = []
@@ -60,13 +64,43 @@ CONVENTIONS = {
 }
 
 
-# pylint: disable=too-many-branches,too-many-statements
+LAZY_DOC = """\
+When True, the density matrices and the entries of ``atcharges``, ``moments`` and
+``extra`` are only parsed when they are accessed for the first time. The file must not
+be modified or removed before that.
+"""
+
+
+ORBITALS_DOC = """\
+When False, the molecular orbitals are not loaded, which avoids parsing the (large)
+orbital coefficients. Instead, ``nelec`` and ``spinpol`` are loaded.
+"""
+
+
+SIDECAR_DOC = """\
+When True, the positions of all fields are stored in a sidecar file (the FCHK filename
+with the suffix ``.index.json``). When the same file is loaded again with an unchanged
+size and modification time, by ``load_one`` or ``load_many``, the sidecar is used
+instead of scanning the file.
+"""
+
+
+SIDECAR_KEY = {'format': 'fchk'}
+
+
+# Fields taken from the header, which are kept regardless of the label patterns.
+HEADER_LABELS = {'title', 'command', 'lot', 'obasis_name'}
+
+
+# pylint: disable=too-many-branches,too-many-statements,too-many-locals
 @document_load_one(
     "Gaussian Formatted Checkpoint",
     ['atcharges', 'atcoords', 'atnums', 'atcorenums', 'lot', 'mo', 'obasis',
      'obasis_name', 'run_type', 'title'],
-    ['energy', 'atfrozen', 'atgradient', 'athessian', 'atmasses', 'one_rdms', 'extra', 'moments'])
-def load_one(lit: LineIterator) -> dict:
+    ['energy', 'atfrozen', 'atgradient', 'athessian', 'atmasses', 'one_rdms', 'extra', 'moments'],
+    {"lazy": LAZY_DOC, "orbitals": ORBITALS_DOC, "sidecar": SIDECAR_DOC})
+def load_one(lit: LineIterator, lazy: bool = False, orbitals: bool = True,
+             sidecar: bool = False) -> dict:
     """Do not edit this docstring. It will be overwritten."""
     fchk = _load_fchk_low(lit, [
         "Number of electrons", "Number of basis functions",
@@ -88,7 +122,7 @@ def load_one(lit: LineIterator) -> dict:
         'MBS Charges', 'Type 6 Charges', 'Type 7 Charges',
         'Polarizability', 'Dipole Moment', 'Quadrupole Moment',
         'Cartesian Gradient', 'Cartesian Force Constants', 'MicOpt',
-    ])
+    ], sidecar)
 
     # A) Load a bunch of simple things
     result = {
@@ -156,18 +190,15 @@ def load_one(lit: LineIterator) -> dict:
     del exponents
 
     result['obasis'] = MolecularBasis(shells, CONVENTIONS, 'L2')
-    nbasis = fchk["Number of basis functions"]
 
     # C) Load density matrices
-    one_rdms = {}
+    one_rdms = _LazyDict()
     _load_dm('Total SCF Density', fchk, one_rdms, 'scf')
     _load_dm('Spin SCF Density', fchk, one_rdms, 'scf_spin')
     # only one of the lots should be present, hence using the same key
     for lot in 'MP2', 'MP3', 'CC', 'CI':
         _load_dm('Total {} Density'.format(lot), fchk, one_rdms, 'post_scf')
         _load_dm('Spin {} Density'.format(lot), fchk, one_rdms, 'post_scf_spin')
-    if one_rdms:
-        result['one_rdms'] = one_rdms
 
     # D) Load the wavefunction
 
@@ -179,62 +210,81 @@ def load_one(lit: LineIterator) -> dict:
     if nalpha < nbeta:
         raise ValueError('n_alpha={0} < n_beta={1} is not valid!'.format(nalpha, nbeta))
 
-    norba = fchk['Alpha Orbital Energies'].shape[0]
-    mo_coeffs = np.copy(fchk['Alpha MO coefficients'].reshape(norba, nbasis).T)
-    mo_energies = np.copy(fchk['Alpha Orbital Energies'])
+    if 'Beta Orbital Energies' not in fchk and nalpha != nbeta and 'scf' in one_rdms:
+        # restricted open-shell: delete dm_full_scf because it is known to be buggy
+        del one_rdms['scf']
 
-    if 'Beta Orbital Energies' in fchk:
-        # unrestricted
-        norbb = fchk['Beta Orbital Energies'].shape[0]
-        mo_coeffs_b = np.copy(fchk['Beta MO coefficients'].reshape(norbb, nbasis).T)
-        mo_coeffs = np.concatenate((mo_coeffs, mo_coeffs_b), axis=1)
-        mo_energies = np.concatenate((mo_energies, np.copy(fchk['Beta Orbital Energies'])), axis=0)
-        mo_occs = np.zeros(norba + norbb)
-        mo_occs[:nalpha] = 1.0
-        mo_occs[norba: norba + nbeta] = 1.0
-        mo = MolecularOrbitals('unrestricted', norba, norbb, mo_occs, mo_coeffs, mo_energies)
+    if orbitals:
+        result['mo'] = _load_mo(fchk, nalpha, nbeta)
     else:
-        # restricted closed-shell and open-shell
-        mo_occs = np.zeros(norba)
-        mo_occs[:nalpha] = 1.0
-        mo_occs[:nbeta] = 2.0
-        if nalpha != nbeta and 'one_rdms' in result:
-            # delete dm_full_scf because it is known to be buggy
-            if 'scf' in result['one_rdms']:
-                result['one_rdms'].pop('scf')
-        mo = MolecularOrbitals('restricted', norba, norba, mo_occs, mo_coeffs, mo_energies)
-    result['mo'] = mo
+        result['nelec'] = nalpha + nbeta
+        result['spinpol'] = nalpha - nbeta
 
     # E) Load properties
+    extra = _LazyDict()
     if 'Polarizability' in fchk:
-        result['extra'] = {'polarizability_tensor': _triangle_to_dense(fchk['Polarizability'])}
-    moments = {}
+        extra.setlazy('polarizability_tensor',
+                      lambda: _triangle_to_dense(fchk['Polarizability']))
+    moments = _LazyDict()
     if 'Dipole Moment' in fchk:
-        moments[(1, 'c')] = fchk['Dipole Moment']
+        moments.setlazy((1, 'c'), lambda: fchk['Dipole Moment'])
     if 'Quadrupole Moment' in fchk:
         # Convert to alphabetical ordering: xx, xy, xz, yy, yz, zz
-        moments[(2, 'c')] = fchk['Quadrupole Moment'][[0, 3, 4, 1, 5, 2]]
-    if moments:
-        result['moments'] = moments
-    atcharges = {}
-    if 'Mulliken Charges' in fchk:
-        atcharges['mulliken'] = fchk['Mulliken Charges']
-    if 'ESP Charges' in fchk:
-        atcharges['esp'] = fchk['ESP Charges']
-    if 'NPA Charges' in fchk:
-        atcharges['npa'] = fchk['NPA Charges']
-    if 'MBS Charges' in fchk:
-        atcharges['mbs'] = fchk['MBS Charges']
-    if 'Type 6 Charges' in fchk:
-        atcharges['hirshfeld'] = fchk['Type 6 Charges']
-    if 'Type 7 Charges' in fchk:
-        atcharges['cm5'] = fchk['Type 7 Charges']
-    if atcharges:
-        result['atcharges'] = atcharges
+        moments.setlazy((2, 'c'), lambda: fchk['Quadrupole Moment'][[0, 3, 4, 1, 5, 2]])
+    atcharges = _LazyDict()
+    for label, key in [('Mulliken Charges', 'mulliken'), ('ESP Charges', 'esp'),
+                       ('NPA Charges', 'npa'), ('MBS Charges', 'mbs'),
+                       ('Type 6 Charges', 'hirshfeld'), ('Type 7 Charges', 'cm5')]:
+        if label in fchk:
+            atcharges.setlazy(key, fchk.loader(label))
+
+    for attrname, value in [('one_rdms', one_rdms), ('extra', extra),
+                            ('moments', moments), ('atcharges', atcharges)]:
+        if value:
+            result[attrname] = value if lazy else dict(value)
 
     return result
 
 
+def _load_mo(fchk: Mapping, nalpha: int, nbeta: int) -> MolecularOrbitals:
+    """Load the molecular orbitals from the FCHK file.
+
+    Parameters
+    ----------
+    fchk
+        The fields from the FCHK file.
+    nalpha, nbeta
+        The number of alpha and beta electrons.
+
+    Returns
+    -------
+    mo
+        The restricted or unrestricted molecular orbitals.
+
+    """
+    nbasis = fchk["Number of basis functions"]
+    mo_energies = fchk['Alpha Orbital Energies']
+    norba = mo_energies.shape[0]
+    mo_coeffs = np.copy(fchk['Alpha MO coefficients'].reshape(norba, nbasis).T)
+
+    if 'Beta Orbital Energies' in fchk:
+        # unrestricted
+        mo_energies_b = fchk['Beta Orbital Energies']
+        norbb = mo_energies_b.shape[0]
+        mo_coeffs_b = np.copy(fchk['Beta MO coefficients'].reshape(norbb, nbasis).T)
+        mo_coeffs = np.concatenate((mo_coeffs, mo_coeffs_b), axis=1)
+        mo_energies = np.concatenate((mo_energies, mo_energies_b), axis=0)
+        mo_occs = np.zeros(norba + norbb)
+        mo_occs[:nalpha] = 1.0
+        mo_occs[norba: norba + nbeta] = 1.0
+        return MolecularOrbitals('unrestricted', norba, norbb, mo_occs, mo_coeffs, mo_energies)
+    # restricted closed-shell and open-shell
+    mo_occs = np.zeros(norba)
+    mo_occs[:nalpha] = 1.0
+    mo_occs[:nbeta] = 2.0
+    return MolecularOrbitals('restricted', norba, norba, mo_occs, mo_coeffs, mo_energies)
+
+
 LOAD_MANY_NOTES = """
 Trajectories from a Gaussian optimization, relaxed scan or IRC calculation are written in
 groups of frames, called "points" in the Gaussian world, e.g. to discrimininate between
@@ -252,12 +302,13 @@ attribute:
 
 
 @document_load_many("XYZ", ['atcoords', 'atgradient', 'atnums', 'atcorenums',
-                            'energy', 'extra', 'title'], [], {}, LOAD_MANY_NOTES)
-def load_many(lit: LineIterator) -> Iterator[dict]:
+                            'energy', 'extra', 'title'], [], {"sidecar": SIDECAR_DOC},
+                    LOAD_MANY_NOTES)
+def load_many(lit: LineIterator, sidecar: bool = False) -> Iterator[dict]:
     """Do not edit this docstring. It will be overwritten."""
     fchk = _load_fchk_low(lit, [
         "Atomic numbers", "Current cartesian coordinates", "Nuclear charges",
-        "IRC *", "Optimization *", "Opt point *"])
+        "IRC *", "Optimization *", "Opt point *"], sidecar)
 
     # Determine the type of calculation: IRC or Optimization
     if "IRC Number of geometries" in fchk:
@@ -269,7 +320,9 @@ def load_many(lit: LineIterator) -> Iterator[dict]:
     else:
         lit.error("Could not find IRC or Optimization trajectory in FCHK file.")
 
-    natom = fchk["Atomic numbers"].size
+    atnums = fchk["Atomic numbers"]
+    atcorenums = fchk["Nuclear charges"]
+    natom = atnums.size
     for ipoint, nstep in enumerate(nsteps):
         results_geoms = fchk["{} {:7d} Results for each geome".format(prefix, ipoint + 1)]
         trajectory = list(zip(
@@ -281,8 +334,8 @@ def load_many(lit: LineIterator) -> Iterator[dict]:
         for istep, (energy, recor, atcoords, gradients) in enumerate(trajectory):
             data = {
                 'title': fchk['title'],
-                'atnums': fchk["Atomic numbers"],
-                'atcorenums': fchk["Nuclear charges"],
+                'atnums': atnums,
+                'atcorenums': atcorenums,
                 'energy': energy,
                 'atcoords': atcoords,
                 'atgradient': gradients,
@@ -298,15 +351,121 @@ def load_many(lit: LineIterator) -> Iterator[dict]:
             yield data
 
 
-def _load_fchk_low(lit: LineIterator, label_patterns: List[str] = None) -> dict:
+class _ArrayLocation(NamedTuple):
+    """Position of an array field in an FCHK file."""
+
+    datatype: type
+    length: int
+    offset: int
+    lineno: int
+
+
+class _FCHKFields(Mapping):
+    """Fields read from an FCHK file.
+
+    Scalar fields are stored as soon as the file is indexed. For array fields, only their
+    location in the file is stored. They are parsed when they are accessed for the first
+    time, after which the parsed array replaces the location. All arrays are read with
+    the line iterator given at construction, after seeking to their location.
+    """
+
+    def __init__(self, lit: LineIterator):
+        self.lit = lit
+        self.filename = lit.filename
+        self.fingerprint = fingerprint(lit.filename)
+        self.fields = {}
+
+    def __getitem__(self, label: str):
+        value = self.fields[label]
+        if isinstance(value, _ArrayLocation):
+            value = self._read_array(value)
+            self.fields[label] = value
+        return value
+
+    def __contains__(self, label):
+        return label in self.fields
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self):
+        return len(self.fields)
+
+    def loader(self, label: str) -> Callable:
+        """Return a function without arguments that loads the given field."""
+        return lambda: self[label]
+
+    def _read_array(self, location: _ArrayLocation) -> np.ndarray:
+        """Parse an array field at the given location."""
+        if fingerprint(self.filename) != self.fingerprint:
+            raise FileFormatError("{}: File changed after it was indexed.".format(
+                self.filename))
+        self.lit.seek(location.offset, location.lineno)
+        try:
+            array = self.lit.read_array(location.length, location.datatype)
+        except StopIteration:
+            self.lit.error("File ended before all data was read.")
+        return array
+
+
+class _LazyDict(MutableMapping):
+    """A dictionary whose values may be computed when they are accessed for the first time."""
+
+    def __init__(self):
+        self._data = {}
+        self._loaders = {}
+
+    def setlazy(self, key, loader: Callable):
+        """Set a value which is computed by calling ``loader()`` upon first access."""
+        self._data[key] = None
+        self._loaders[key] = loader
+
+    def __getitem__(self, key):
+        if key in self._loaders:
+            self._data[key] = self._loaders.pop(key)()
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._loaders.pop(key, None)
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        self._loaders.pop(key, None)
+        del self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return "{{{}}}".format(", ".join(
+            "{!r}: {}".format(key, "<not loaded>" if key in self._loaders else repr(value))
+            for key, value in self._data.items()))
+
+
+def _load_fchk_low(lit: LineIterator, label_patterns: List[str] = None,
+                   sidecar: bool = False) -> Mapping:
     """Read selected fields from a formatted checkpoint file.
 
+    The file is first indexed, without parsing the array fields. These are only
+    parsed when they are accessed in the returned mapping.
+
     Parameters
     ----------
     lit
         The line iterator to read the data from.
     label_patterns
         A list of Unix shell-style wildcard patterns of labels to read.
+    sidecar
+        When True, the index of all fields is loaded from a sidecar file, if it
+        exists and is up to date, and the fields matching label_patterns are
+        selected from it. Otherwise, the sidecar file is (re)written after
+        indexing all fields.
 
     Returns
     -------
@@ -315,13 +474,26 @@ def _load_fchk_low(lit: LineIterator, label_patterns: List[str] = None) -> dict:
         are either scalar or array data. Arrays are always one-dimensional.
 
     """
+    if sidecar:
+        # The sidecar contains all fields, such that it serves any label_patterns.
+        fchk = _load_fchk_sidecar(lit)
+        if fchk is None:
+            fchk = _load_fchk_low(lit)
+            _dump_fchk_sidecar(fchk)
+        if label_patterns is not None:
+            label_regex = _compile_label_patterns(tuple(label_patterns))
+            fchk.fields = {label: value for label, value in fchk.fields.items()
+                           if label in HEADER_LABELS or label_regex.match(label)}
+        return fchk
+
+    fchk = _FCHKFields(lit)
     # Read the two-line header
-    result = {'title': next(lit).strip()}
+    fchk.fields['title'] = next(lit).strip()
     words = next(lit).split()
     if len(words) == 3:
-        result['command'], result['lot'], result['obasis_name'] = words
+        fchk.fields['command'], fchk.fields['lot'], fchk.fields['obasis_name'] = words
     elif len(words) == 2:
-        result['command'], result['lot'] = words
+        fchk.fields['command'], fchk.fields['lot'] = words
     else:
         lit.error('The second line of the FCHK file should contain two or three words.')
 
@@ -331,8 +503,68 @@ def _load_fchk_low(lit: LineIterator, label_patterns: List[str] = None) -> dict:
         except StopIteration:
             # We always read until the end of the file.
             break
-        result[label] = value
-    return result
+        fchk.fields[label] = value
+    return fchk
+
+
+def _load_fchk_sidecar(lit: LineIterator) -> _FCHKFields:
+    """Load the index of all fields in an FCHK file from its sidecar file.
+
+    Parameters
+    ----------
+    lit
+        The line iterator of the FCHK file, used to read the array fields.
+
+    Returns
+    -------
+    fields
+        The indexed fields or None when the sidecar is missing, unreadable or
+        out of date.
+
+    """
+    fields = load_sidecar(lit.filename, SIDECAR_KEY)
+    if fields is None:
+        return None
+    fchk = _FCHKFields(lit)
+    try:
+        for label, value in fields.items():
+            if isinstance(value, dict):
+                value = _ArrayLocation(
+                    int if value['datatype'] == 'I' else float,
+                    value['length'], value['offset'], value['lineno'])
+            fchk.fields[label] = value
+    except (AttributeError, KeyError, TypeError):
+        # The sidecar is valid JSON but not an FCHK index.
+        return None
+    return fchk
+
+
+def _dump_fchk_sidecar(fchk: _FCHKFields):
+    """Write the index of all fields in an FCHK file to its sidecar file, if possible.
+
+    Parameters
+    ----------
+    fchk
+        The indexed fields, obtained without label patterns.
+
+    """
+    fields = {}
+    for label, value in fchk.fields.items():
+        if isinstance(value, _ArrayLocation):
+            value = {
+                'datatype': 'I' if value.datatype is int else 'R',
+                'length': value.length,
+                'offset': value.offset,
+                'lineno': value.lineno,
+            }
+        fields[label] = value
+    dump_sidecar(fchk.filename, SIDECAR_KEY, fchk.fingerprint, fields)
+
+
+@lru_cache(maxsize=16)
+def _compile_label_patterns(label_patterns: Tuple[str]):
+    """Compile Unix shell-style wildcard patterns into a single regular expression."""
+    return re.compile("|".join(translate(label_pattern) for label_pattern in label_patterns))
 
 
 # pylint: disable=too-many-branches
@@ -352,7 +584,7 @@ def _load_fchk_field(lit: LineIterator, label_patterns: List[str]) -> Tuple[str,
     label
         The name of the field
     value
-        The scalar or array data of the field.
+        The scalar data of the field or the location of the array data.
 
     """
     while True:
@@ -369,7 +601,7 @@ def _load_fchk_field(lit: LineIterator, label_patterns: List[str]) -> Tuple[str,
         else:
             continue
         if not (label_patterns is None
-                or any(fnmatch(label, label_pattern) for label_pattern in label_patterns)):
+                or _compile_label_patterns(tuple(label_patterns)).match(label)):
             continue
         if len(words) == 2:
             try:
@@ -380,22 +612,18 @@ def _load_fchk_field(lit: LineIterator, label_patterns: List[str]) -> Tuple[str,
             if words[1] != "N=":
                 lit.error("Expected N= not found.")
             length = int(words[2])
-            value = np.zeros(length, datatype)
-            counter = 0
-            words = []
-            while counter < length:
-                if not words:
-                    words = next(lit).split()
-                word = words.pop(0)
-                try:
-                    value[counter] = datatype(word)
-                except (ValueError, OverflowError):
-                    lit.error('Could not interpret: {}'.format(word))
-                counter += 1
-            return label, value
-
-
-def _load_dm(label: str, fchk: dict, result: dict, key: str):
+            location = _ArrayLocation(datatype, length, lit.tell(), lit.lineno)
+            # Skip the data lines without parsing them. They contain five reals
+            # or six integers each and always start with a space.
+            for _iline in range(-(-length // (6 if datatype is int else 5))):
+                line = next(lit)
+                if not line.startswith(' '):
+                    lit.back(line)
+                    break
+            return label, location
+
+
+def _load_dm(label: str, fchk: Mapping, result: _LazyDict, key: str):
     """Load a density matrix from the FCHK file if present.
 
     Parameters
@@ -411,7 +639,7 @@ def _load_dm(label: str, fchk: dict, result: dict, key: str):
 
     """
     if label in fchk:
-        result[key] = _triangle_to_dense(fchk[label])
+        result.setlazy(key, lambda: _triangle_to_dense(fchk[label]))
 
 
 def _triangle_to_dense(triangle: np.ndarray) -> np.ndarray:
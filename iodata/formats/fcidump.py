@@ -29,13 +29,13 @@ Notes
 """
 
 
-from typing import TextIO
+from typing import Iterator, TextIO, Tuple
 
 import numpy as np
 
 from ..docstrings import document_load_one, document_dump_one
 from ..iodata import IOData
-from ..utils import set_four_index_element, LineIterator
+from ..utils import set_four_index_elements, LineIterator, PackedFourIndex
 
 
 __all__ = []
@@ -44,9 +44,60 @@ __all__ = []
 PATTERNS = ['*FCIDUMP*']
 
 
+PACKED_DOC = """\
+When True, ``two_ints['two_mo']`` is a ``PackedFourIndex`` instance, which only
+stores the unique elements and unpacks them on demand. This reduces the memory
+usage by nearly a factor eight.
+"""
+
+
+def _load_fcidump_data(lit: LineIterator) -> Tuple[np.ndarray, np.ndarray]:
+    """Load all data lines of an FCIDUMP file at once.
+
+    Parameters
+    ----------
+    lit
+        The line iterator to read the data from, positioned after the header.
+
+    Returns
+    -------
+    values
+        The values on all data lines.
+    indexes
+        The four indexes on all data lines, converted to zero-based indexes,
+        such that zeros in the file become -1. shape=(nline, 4)
+
+    """
+    lineno = lit.lineno
+    lines = lit.read_lines()
+    words = " ".join(lines).split()
+    if len(words) != 5 * len(lines):
+        # Find the offending line, such that the line number is correct.
+        for iline, line in enumerate(lines):
+            if len(line.split()) != 5:
+                lit.lineno = lineno + iline + 1
+                lit.error('Expecting 5 fields on each data line in FCIDUMP')
+    try:
+        values = np.array(words[::5], dtype=float)
+        del words[::5]
+        indexes = np.array(words, dtype=int).reshape(-1, 4) - 1
+    except ValueError:
+        # Find the offending line, such that the line number is correct.
+        for iline, line in enumerate(lines):
+            value, *line_indexes = line.split()
+            try:
+                float(value)
+                np.array(line_indexes, dtype=int)
+            except ValueError:
+                lit.lineno = lineno + iline + 1
+                lit.error('Could not interpret data line in FCIDUMP')
+        raise
+    return values, indexes
+
+
 @document_load_one("Molpro 2012 FCIDUMP", ['core_energy', 'one_ints', 'nelec', 'spinpol',
-                                           'two_ints'])
-def load_one(lit: LineIterator) -> dict:
+                                           'two_ints'], [], {"packed": PACKED_DOC})
+def load_one(lit: LineIterator, packed: bool = False) -> dict:
     """Do not edit this docstring. It will be overwritten."""
     # check header
     line = next(lit)
@@ -72,30 +123,28 @@ def load_one(lit: LineIterator) -> dict:
 
     # read the integrals
     one_mo = np.zeros((nbasis, nbasis))
-    two_mo = np.zeros((nbasis, nbasis, nbasis, nbasis))
+    if packed:
+        two_mo = PackedFourIndex(nbasis)
+    else:
+        two_mo = np.zeros((nbasis, nbasis, nbasis, nbasis))
     core_energy = 0.0
 
-    for line in lit:
-        words = line.split()
-        if len(words) != 5:
-            lit.error('Expecting 5 fields on each data line in FCIDUMP')
-        value = float(words[0])
-        if words[3] != '0':
-            ii = int(words[1]) - 1
-            ij = int(words[2]) - 1
-            ik = int(words[3]) - 1
-            il = int(words[4]) - 1
-            # Uncomment the following line if you want to assert that the
-            # FCIDUMP file does not contain duplicate 4-index entries.
-            # assert two_mo.get_element(ii,ik,ij,il) == 0.0
-            set_four_index_element(two_mo, ii, ik, ij, il, value)
-        elif words[1] != '0':
-            ii = int(words[1]) - 1
-            ij = int(words[2]) - 1
-            one_mo[ii, ij] = value
-            one_mo[ij, ii] = value
-        else:
-            core_energy = value
+    values, indexes = _load_fcidump_data(lit)
+    # two-electron integrals, physicists' notation is used in IOData
+    two = indexes[:, 2] >= 0
+    # Uncomment the following line if you want to assert that the
+    # FCIDUMP file does not contain duplicate 4-index entries.
+    # assert len(np.unique(indexes[two], axis=0)) == two.sum()
+    set_four_index_elements(two_mo, *indexes[two].T, values[two], 'chemists')
+    # one-electron integrals
+    one = ~two & (indexes[:, 0] >= 0)
+    ii, ij = indexes[one, :2].T
+    one_mo[ii, ij] = values[one]
+    one_mo[ij, ii] = values[one]
+    # core energy, the last one is used when there are several
+    core = ~two & ~one
+    if core.any():
+        core_energy = values[core][-1]
 
     return {
         'nelec': nelec,
@@ -108,13 +157,76 @@ def load_one(lit: LineIterator) -> dict:
 
 LOAD_ONE_NOTES = """
 The dictionary ``one_ints`` must contain a field ``core_mo``. Similarly, ``two_ints`` must
-contain ``two_mo``.
+contain ``two_mo``, which can be a dense array or a ``PackedFourIndex`` instance.
+"""
+
+
+THRESHOLD_DOC = """\
+Integrals whose absolute value does not exceed this threshold are not written.
+The default only skips integrals that are exactly zero. NaN values are always written.
 """
 
 
+# Format of a data line, also used for integer indexes stored as floats.
+DATA_LINE_FORMAT = '%23.16e %4d %4d %4d %4d\n'
+
+
+def _write_fcidump_data(f: TextIO, values: np.ndarray, i: np.ndarray, j: np.ndarray,
+                        k: np.ndarray, l: np.ndarray):
+    """Write data lines to an FCIDUMP file, formatting many lines at once.
+
+    Parameters
+    ----------
+    f
+        The file to write to.
+    values
+        The values of the integrals.
+    i, j, k, l
+        The one-based indexes of the integrals, zero for unused indexes.
+
+    """
+    table = np.column_stack([values, i, j, k, l])
+    nline_chunk = 16384
+    for begin in range(0, len(table), nline_chunk):
+        chunk = table[begin:begin + nline_chunk]
+        f.write((DATA_LINE_FORMAT * len(chunk)) % tuple(chunk.ravel().tolist()))
+
+
+def _iter_two_mo(two_mo, threshold: float) -> Iterator[Tuple[np.ndarray, ...]]:
+    """Iterate over the unique two-electron integrals to be written, in chunks.
+
+    Parameters
+    ----------
+    two_mo
+        The two-electron integrals in physicists' notation, either as a dense array or
+        as a ``PackedFourIndex`` instance.
+    threshold
+        Integrals whose absolute value does not exceed this threshold are skipped.
+
+    Yields
+    ------
+    values, p, q, r, s
+        Arrays with the integrals :math:`(pq|rs)` and their zero-based indexes in
+        chemists' notation, in the order of the packed form.
+
+    """
+    if isinstance(two_mo, PackedFourIndex):
+        yield two_mo.nonzero(threshold)
+        return
+    # Take the unique elements of the dense array directly, one row of the packed form
+    # at a time, to avoid a packed copy of the whole array.
+    p, q = np.tril_indices(len(two_mo))
+    for pq, (ip, iq) in enumerate(zip(p, q)):
+        r, s = p[:pq + 1], q[:pq + 1]
+        values = two_mo[ip, r, iq, s]
+        mask = ~(abs(values) <= threshold)
+        yield values[mask], np.full(mask.sum(), ip), np.full(mask.sum(), iq), r[mask], s[mask]
+
+
 @document_dump_one("Molpro 2012 FCIDUMP", ['one_ints', 'two_ints'],
-                   ['core_energy', 'nelec', 'spinpol'], {}, LOAD_ONE_NOTES)
-def dump_one(f: TextIO, data: IOData):
+                   ['core_energy', 'nelec', 'spinpol'], {"threshold": THRESHOLD_DOC},
+                   LOAD_ONE_NOTES)
+def dump_one(f: TextIO, data: IOData, threshold: float = 0.0):
     """Do not edit this docstring. It will be overwritten."""
     one_mo = data.one_ints['core_mo']
 
@@ -127,20 +239,14 @@ def dump_one(f: TextIO, data: IOData):
     print('  ISYM=1', file=f)
     print(' &END', file=f)
 
-    # Write integrals and core energy
-    two_mo = data.two_ints['two_mo']
-    for i in range(nactive):  # pylint: disable=too-many-nested-blocks
-        for j in range(i + 1):
-            for k in range(nactive):
-                for l in range(k + 1):
-                    if (i * (i + 1)) / 2 + j >= (k * (k + 1)) / 2 + l:
-                        value = two_mo[i, k, j, l]
-                        if value != 0.0:
-                            print(f'{value:23.16e} {i+1:4d} {j+1:4d} {k+1:4d} {l+1:4d}', file=f)
-    for i in range(nactive):
-        for j in range(i + 1):
-            value = one_mo[i, j]
-            if value != 0.0:
-                print(f'{value:23.16e} {i+1:4d} {j+1:4d} {0:4d} {0:4d}', file=f)
+    # Write integrals and core energy. The unique two-electron integrals are
+    # written in the order of the packed form, as in FCIDUMP files.
+    for values, i, j, k, l in _iter_two_mo(data.two_ints['two_mo'], threshold):
+        _write_fcidump_data(f, values, i + 1, j + 1, k + 1, l + 1)
+    i, j = np.tril_indices(nactive)
+    values = one_mo[i, j]
+    mask = ~(abs(values) <= threshold)
+    zeros = np.zeros(mask.sum())
+    _write_fcidump_data(f, values[mask], i[mask] + 1, j[mask] + 1, zeros, zeros)
     if data.core_energy is not None:
         print(f'{data.core_energy:23.16e} {0:4d} {0:4d} {0:4d} {0:4d}', file=f)
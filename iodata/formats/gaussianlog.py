@@ -25,13 +25,24 @@ you need to use the following Gaussian command line:
 
     scf(conventional) iop(3/33=5) extralinks=l316 iop(3/27=999)
 
+The ``load_many`` function loads the geometries of an optimization or another
+calculation with multiple steps, e.g. a scan, together with the energy and the
+forces of each step. The geometries are taken from the input (or Z-matrix)
+orientation, in which Gaussian also prints the forces. Only when the file
+contains no such orientation, e.g. in a trimmed log file, the standard
+orientation is used instead.
+
 """
 
 
+import re
+from typing import Iterator, List, Tuple, Union
+
 import numpy as np
 
-from ..docstrings import document_load_one
-from ..utils import set_four_index_element, LineIterator
+from ..docstrings import document_load_one, document_load_many
+from ..utils import (set_four_index_elements, LineIterator, PackedFourIndex, SparseFourIndex,
+                     angstrom)
 
 
 __all__ = []
@@ -40,22 +51,42 @@ __all__ = []
 PATTERNS = ['*.log']
 
 
-@document_load_one("Gaussian Log", [], ['one_ints', 'two_ints'])
-def load_one(lit: LineIterator) -> dict:
+# Regular expression matching all section headers handled by load_one.
+SECTION_PATTERN = "|".join(re.escape(header) for header in [
+    " *** Overlap ***",
+    " *** Kinetic Energy ***",
+    " ***** Potential Energy *****",
+    " *** Dumping Two-Electron integrals ***",
+    " Normal termination of Gaussian",
+])
+
+
+STORAGE_DOC = """\
+How the electron repulsion integrals ``two_ints['er_ao']`` are stored:
+``'dense'`` (a NumPy array), ``'packed'`` (a ``PackedFourIndex`` instance with all
+unique elements) or ``'sparse'`` (a ``SparseFourIndex`` instance with only the
+elements printed by Gaussian). The latter two behave like arrays and can be
+converted to a dense array with ``np.asarray``.
+"""
+
+
+@document_load_one("Gaussian Log", [], ['one_ints', 'two_ints'], {"storage": STORAGE_DOC})
+def load_one(lit: LineIterator, storage: str = 'dense') -> dict:
     """Do not edit this docstring. It will be overwritten."""
+    if storage not in ('dense', 'packed', 'sparse'):
+        raise ValueError("Unknown storage: {}".format(storage))
     # First get the line with the number of orbital basis functions
-    for line in lit:
-        if line.startswith('    NBasis ='):
-            nbasis = int(line[12:18])
-            break
+    for line in lit.scan('    NBasis ='):
+        nbasis = int(line[12:18])
+        break
 
     # Then load the two- and four-index operators. This part is written such
     # that it does not make any assumptions about the order in which these
-    # operators are printed.
+    # operators are printed. Only the section headers are searched for, which
+    # is much faster than checking every line of the log file.
     one_ints = {}
     two_ints = {}
-    while True:
-        line = next(lit)
+    for line in lit.scan(SECTION_PATTERN):
         if line.startswith(" Normal termination of Gaussian"):
             break
         if line.startswith(' *** Overlap ***'):
@@ -65,7 +96,9 @@ def load_one(lit: LineIterator) -> dict:
         elif line.startswith(' ***** Potential Energy *****'):
             one_ints['na_ao'] = _load_twoindex_g09(lit, nbasis)
         elif line.startswith(' *** Dumping Two-Electron integrals ***'):
-            two_ints['er_ao'] = _load_fourindex_g09(lit, nbasis)
+            two_ints['er_ao'] = _load_fourindex_g09(lit, nbasis, storage)
+    else:
+        raise StopIteration
 
     result = {}
     if one_ints:
@@ -91,24 +124,37 @@ def _load_twoindex_g09(lit: LineIterator, nbasis: int) -> np.ndarray:
         The output (nbasis, nbasis) array of operator.
 
     """
-    result = np.zeros((nbasis, nbasis))
-    block_counter = 0
-    while block_counter < nbasis:
+    # The lower triangle is printed in panels of (at most) five columns. Each
+    # panel has a header line, followed by one line per row, starting with
+    # the row number. The lines of all panels are collected first, such that
+    # all values can be converted and stored at once.
+    lines = []
+    for begin in range(0, nbasis, 5):
         # skip the header line
         next(lit)
-        # determine the number of rows in this part
-        nrow = nbasis - block_counter
-        for i in range(nrow):
-            words = next(lit).split()[1:]
-            for j, word in enumerate(words):
-                value = float(word.replace('D', 'E'))
-                result[i + block_counter, j + block_counter] = value
-                result[j + block_counter, i + block_counter] = value
-        block_counter += 5
+        lines.extend(next(lit) for _ in range(begin, nbasis))
+    # The row, first column and number of values of each line.
+    begins = np.concatenate([np.full(nbasis - begin, begin) for begin in range(0, nbasis, 5)])
+    rows = np.concatenate([np.arange(begin, nbasis) for begin in range(0, nbasis, 5)])
+    counts = np.minimum(rows - begins + 1, 5)
+    words = " ".join(lines).replace('D', 'E').split()
+    if len(words) != counts.sum() + len(lines):
+        lit.error("Unexpected number of values in two-index operator.")
+    # Remove the row numbers at the beginning of each line.
+    labels = np.zeros(len(words), dtype=bool)
+    labels[np.cumsum(counts + 1) - counts - 1] = True
+    values = np.array(words, dtype=float)[~labels]
+    # Scatter the values into the symmetric result.
+    irows = np.repeat(rows, counts)
+    icols = np.arange(len(values)) - np.repeat(np.cumsum(counts) - counts - begins, counts)
+    result = np.zeros((nbasis, nbasis))
+    result[irows, icols] = values
+    result[icols, irows] = values
     return result
 
 
-def _load_fourindex_g09(lit: LineIterator, nbasis: int) -> np.ndarray:
+def _load_fourindex_g09(lit: LineIterator, nbasis: int,
+                        storage: str = 'dense') -> Union[np.ndarray, PackedFourIndex]:
     """Load a four-index operator from a GAUSSIAN LOG file.
 
     Parameters
@@ -117,29 +163,151 @@ def _load_fourindex_g09(lit: LineIterator, nbasis: int) -> np.ndarray:
         The line iterator to read the data from.
     nbasis
         The number of atomic orbital basis functions.
+    storage
+        How the result is stored: ``'dense'``, ``'packed'`` or ``'sparse'``.
 
     Returns
     -------
     out
-        The (nbasis, nbasis, nbasis, nbasis) array of operator.
+        The (nbasis, nbasis, nbasis, nbasis) operator, as a dense array or as an
+        instance of ``PackedFourIndex`` or ``SparseFourIndex``.
 
     """
-    result = np.zeros((nbasis, nbasis, nbasis, nbasis))
     # Skip first six lines
-    for i in range(6):
-        next(lit)
-    # Start reading elements until a line is encountered that does not start
-    # with ' I='
+    lit.skip_lines(6)
+    # Collect lines until a line is encountered that does not start with ' I='
+    lines = []
     for line in lit:
         if not line.startswith(' I='):
             break
-        # print line[3:7], line[9:13], line[15:19], line[21:25], line[28:].replace('D', 'E')
-        i = int(line[3:7]) - 1
-        j = int(line[9:13]) - 1
-        k = int(line[15:19]) - 1
-        l = int(line[21:25]) - 1
-        value = float(line[29:].replace('D', 'E'))
-        # Gaussian uses the chemists notation for the 4-center indexes. IOdata
-        # uses the physicists notation.
-        set_four_index_element(result, i, k, j, l, value)
+        lines.append(line.rstrip())
+    # The lines have fixed-width columns, e.g.
+    # " I=  6 J=  2 K=  5 L=  1 Int=  0.708496640384D-02"
+    # All lines are padded to the same width and converted at once.
+    width = max((len(line) for line in lines), default=30)
+    table = np.frombuffer(
+        "".join(line.ljust(width) for line in lines).encode(), dtype='S1').reshape(-1, width)
+    indexes = np.array([table[:, begin:begin + 4].copy().view('S4').ravel()
+                        for begin in (3, 9, 15, 21)]).astype(int) - 1
+    digits = table[:, 29:].copy()
+    digits[digits == b'D'] = b'E'
+    values = digits.view('S{}'.format(width - 29)).ravel().astype(float)
+    # Gaussian uses the chemists notation for the 4-center indexes. IOdata
+    # uses the physicists notation.
+    if storage == 'sparse':
+        return SparseFourIndex.from_elements(nbasis, *indexes, values, 'chemists')
+    if storage == 'packed':
+        result = PackedFourIndex(nbasis)
+    else:
+        result = np.zeros((nbasis, nbasis, nbasis, nbasis))
+    set_four_index_elements(result, *indexes, values, 'chemists')
     return result
+
+
+# Regular expression matching all lines handled by load_many.
+FRAME_PATTERN = "|".join([
+    r" +(Input|Z-Matrix|Standard) orientation:",
+    re.escape(" SCF Done:"),
+    r" Center +Atomic +Forces \(Hartrees/Bohr\)",
+])
+
+
+@document_load_many("Gaussian Log", ['atcoords', 'atnums'], ['atgradient', 'energy'])
+def load_many(lit: LineIterator) -> Iterator[dict]:
+    """Do not edit this docstring. It will be overwritten."""
+    # Each frame starts with an orientation of the kind that comes first in the file:
+    # the input orientation, printed before the standard one, unless it is absent.
+    # Only the lines of interest are located in the file, such that the rest of the
+    # output is skipped efficiently.
+    frame = {}
+    frame_title = None
+    for line in lit.scan(FRAME_PATTERN):
+        if line.startswith(' SCF Done:'):
+            if frame:
+                frame['energy'] = float(line.split('=')[1].split()[0])
+        elif line.startswith(' Center'):
+            if frame:
+                frame['atgradient'] = -_load_forces_g09(lit)
+        else:
+            title = line.strip()
+            if frame_title is None:
+                frame_title = title
+            elif title != frame_title:
+                continue
+            # Orientations without an energy, e.g. the one printed after an
+            # optimization has converged, are not a separate frame.
+            if 'energy' in frame:
+                yield frame
+            atnums, atcoords = _load_orientation_g09(lit)
+            frame = {'atnums': atnums, 'atcoords': atcoords}
+    if 'energy' in frame:
+        yield frame
+
+
+def _load_table_g09(lit: LineIterator) -> List[List[str]]:
+    """Load the rows of a table with one line per atom from a GAUSSIAN LOG file.
+
+    Parameters
+    ----------
+    lit
+        The line iterator to read the data from, positioned in the header of the
+        table. The header ends with a line of dashes.
+
+    Returns
+    -------
+    out
+        The words on each row of the table.
+
+    """
+    # skip the rest of the header
+    for line in lit:
+        if line.startswith(' ---'):
+            break
+    rows = []
+    for line in lit:
+        if line.startswith(' ---'):
+            break
+        rows.append(line.split())
+    return rows
+
+
+def _load_forces_g09(lit: LineIterator) -> np.ndarray:
+    """Load the atomic forces from a GAUSSIAN LOG file.
+
+    Parameters
+    ----------
+    lit
+        The line iterator to read the data from, positioned after the title of the
+        forces table.
+
+    Returns
+    -------
+    out
+        The (natom, 3) array with the forces in atomic units.
+
+    """
+    return np.array([words[2:5] for words in _load_table_g09(lit)], dtype=float)
+
+
+def _load_orientation_g09(lit: LineIterator) -> Tuple[np.ndarray, np.ndarray]:
+    """Load the atomic numbers and coordinates from an orientation in a GAUSSIAN LOG file.
+
+    Parameters
+    ----------
+    lit
+        The line iterator to read the data from, positioned after the title of the
+        orientation.
+
+    Returns
+    -------
+    atnums, atcoords
+        The atomic numbers and the Cartesian coordinates in atomic units.
+
+    """
+    # skip the dashes above the header
+    next(lit)
+    rows = _load_table_g09(lit)
+    atnums = np.array([words[1] for words in rows], dtype=int)
+    # The last three columns contain the coordinates in Angstrom.
+    atcoords = np.array([words[-3:] for words in rows], dtype=float) * angstrom
+    return atnums, atcoords
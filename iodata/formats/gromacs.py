@@ -88,6 +88,26 @@ def load_many(lit: LineIterator) -> Iterator[dict]:
             return
 
 
+def skip_one(lit: LineIterator):
+    """Skip one GRO frame without parsing the atom lines.
+
+    Parameters
+    ----------
+    lit
+        The line iterator to read the data from.
+
+    Raises
+    ------
+    StopIteration
+        When no complete frame is left.
+
+    """
+    # Skip the title, the atom lines and the cell line.
+    next(lit)
+    natoms = int(next(lit))
+    lit.skip_lines(natoms + 1)
+
+
 def _helper_read_frame(lit: LineIterator) -> Tuple:
     """Read one frame."""
     # Read the first line, get the title and try to get the time.
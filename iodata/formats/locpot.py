@@ -29,6 +29,7 @@ different conversions to atomic units.
 from ..docstrings import document_load_one
 from ..utils import electronvolt, LineIterator
 from .chgcar import _load_vasp_grid
+from .cube import LAZY_DOC, REGION_DOC
 
 
 __all__ = []
@@ -37,10 +38,11 @@ __all__ = []
 PATTERNS = ['LOCPOT*']
 
 
-@document_load_one("VASP 5 LOCPOT", ['atcoords', 'atnums', 'cellvecs', 'cube', 'title'])
-def load_one(lit: LineIterator) -> dict:
+@document_load_one("VASP 5 LOCPOT", ['atcoords', 'atnums', 'cellvecs', 'cube', 'title'],
+                   [], {"lazy": LAZY_DOC, "region": REGION_DOC})
+def load_one(lit: LineIterator, lazy: bool = False, region: tuple = None) -> dict:
     """Do not edit this docstring. It will be overwritten."""
-    result = _load_vasp_grid(lit)
+    result = _load_vasp_grid(lit, lazy, region)
     # convert locpot to atomic units
-    result['cube'].data[:] *= electronvolt
+    result['cube'].data *= electronvolt
     return result
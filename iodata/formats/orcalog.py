@@ -19,11 +19,12 @@
 """Orca output file format."""
 
 
-from typing import TextIO, Tuple
+import re
+from typing import Iterator, TextIO, Tuple
 
 import numpy as np
 
-from ..docstrings import document_load_one
+from ..docstrings import document_load_one, document_load_many
 from ..utils import LineIterator
 
 
@@ -33,37 +34,75 @@ __all__ = []
 PATTERNS = ['*.out']
 
 
+# Regular expression matching the first line of all sections handled by _load_steps.
+SECTION_PATTERN = "|".join(re.escape(prefix) for prefix in [
+    'CARTESIAN COORDINATES (ANGSTROEM)',
+    'CARTESIAN COORDINATES (A.U.)',
+    'SCF ITERATIONS',
+    'FINAL SINGLE POINT ENERGY',
+    'Total Dipole Moment',
+])
+
+
 @document_load_one("Orca output", ['atcoords', 'atnums', 'energy', 'moments', 'extra'])
 def load_one(lit: LineIterator) -> dict:
     """Do not edit this docstring. It will be overwritten."""
+    # Every result found is replaced with the one of the next step, to maintain
+    # the ones from the final SCF iteration in e.g. optimization run.
     result = {}
-    while True:
-        try:
-            line = next(lit)
-        except StopIteration:
-            # Read until the end of the file.
-            break
+    for step in _load_steps(lit):
+        result.update(step)
+    return result
+
+
+@document_load_many("Orca output", ['atcoords', 'atnums', 'energy', 'moments', 'extra'])
+def load_many(lit: LineIterator) -> Iterator[dict]:
+    """Do not edit this docstring. It will be overwritten."""
+    # Each step of e.g. an optimization is a frame.
+    yield from _load_steps(lit)
+
+
+def _load_steps(lit: LineIterator) -> Iterator[dict]:
+    """Load the results of each step, e.g. in a geometry optimization, from an ORCA output.
+
+    Parameters
+    ----------
+    lit
+        The line iterator to read the data from.
+
+    Yields
+    ------
+    step
+        A dictionary with the results found in one step. A new step starts with
+        each geometry in the file.
+
+    """
+    step = {}
+    # Only the first lines of the sections are located, such that all other
+    # lines are skipped efficiently.
+    for line in lit.scan(SECTION_PATTERN):
         # Get the total number of atoms
         if line.startswith('CARTESIAN COORDINATES (ANGSTROEM)'):
+            if step:
+                yield step
+                step = {}
             natom = _helper_number_atoms(lit)
-        # Every Cartesian coordinates found are replaced with the old ones
-        # to maintain the ones from the final SCF iteration in e.g. optimization run
-        if line.startswith('CARTESIAN COORDINATES (A.U.)'):
-            result['atnums'], result['atcoords'] = _helper_geometry(lit, natom)
+        elif line.startswith('CARTESIAN COORDINATES (A.U.)'):
+            step['atnums'], step['atcoords'] = _helper_geometry(lit, natom)
         # Read the energies of each SCF cycle in iodata.extra
-        if line.startswith('SCF ITERATIONS'):
-            scf_energies = _helper_scf_energies(lit)
-            result['extra'] = {'scf_energies': scf_energies}
+        elif line.startswith('SCF ITERATIONS'):
+            step['extra'] = {'scf_energies': _helper_scf_energies(lit)}
         # The final SCF energy is obtained
-        if line.startswith('FINAL SINGLE POINT ENERGY'):
+        elif line.startswith('FINAL SINGLE POINT ENERGY'):
             words = line.split()
-            result['energy'] = float(words[4])
+            step['energy'] = float(words[4])
         # Read also the dipole moment
-        if line.startswith('Total Dipole Moment'):
+        elif line.startswith('Total Dipole Moment'):
             words = line.split()
             dipole = np.array([float(words[4]), float(words[5]), float(words[6])])
-            result['moments'] = {(1, 'c'): dipole}
-    return result
+            step['moments'] = {(1, 'c'): dipole}
+    if step:
+        yield step
 
 
 def _helper_number_atoms(lit: LineIterator) -> int:
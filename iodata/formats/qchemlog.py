@@ -21,7 +21,8 @@
 This module will load Q-Chem log file into IODATA.
 """
 
-from typing import Tuple
+import re
+from typing import Sequence, Tuple
 from distutils.util import strtobool
 
 import numpy as np
@@ -36,13 +37,42 @@ __all__ = []
 PATTERNS = ['*.qchemlog']
 
 
+# The first lines of the sections in a Q-Chem log file, ignoring leading whitespace.
+SECTION_PREFIXES = {
+    'rem': ['$rem'],
+    'structure': ['Standard Nuclear Orientation (Angstroms)'],
+    'energy': ['Total energy in the final basis set', 'the SCF tolerance is set'],
+    'orbital_energies': ['Orbital Energies (a.u.)'],
+    'mulliken': ['Ground-State Mulliken Net Atomic Charges'],
+    'multipoles': ['Cartesian Multipole Moments'],
+    'polarizability': ['Polarizability Matrix (a.u.)'],
+    'hessian': ['Hessian of the SCF Energy'],
+    'vibrational': ['**                       VIBRATIONAL ANALYSIS'],
+    'thermo': ['Rotational Symmetry Number'],
+    'eda2': ['Results of EDA2'],
+}
+
+
+# Sections that are always loaded because the others depend on them.
+REQUIRED_SECTIONS = ['rem', 'structure']
+
+
+SECTIONS_DOC = """\
+The names of the sections to be loaded. When not given, all sections are
+loaded. Other sections are skipped without being parsed. The sections
+``'rem'`` and ``'structure'`` are always loaded. Optional sections are:
+{}. Without ``'orbital_energies'``, the ``mo`` attribute is set to None.
+""".format(", ".join("``'{}'``".format(name) for name in SECTION_PREFIXES
+                     if name not in REQUIRED_SECTIONS))
+
+
 @document_load_one("qchemlog",
                    ['atcoords', 'atmasses', 'atnums', 'energy', 'g_rot', 'mo',
                     'lot', 'obasis_name', 'run_type', 'extra'],
-                   ['athessian'])
-def load_one(lit: LineIterator) -> dict:
+                   ['athessian'], {"sections": SECTIONS_DOC})
+def load_one(lit: LineIterator, sections: Sequence[str] = None) -> dict:
     """Do not edit this docstring. It will be overwritten."""
-    data = load_qchemlog_low(lit)
+    data = load_qchemlog_low(lit, sections)
 
     # add these labels if they are loaded
     result_labels = ['atcoords', 'atmasses', 'atnums', 'energy', 'g_rot',
@@ -55,7 +85,10 @@ def load_one(lit: LineIterator) -> dict:
 
     # build molecular orbitals
     # ------------------------
-    if data['unrestricted']:
+    if 'mo_a_occ' not in data:
+        # orbital energies were not loaded
+        mo = None
+    elif data['unrestricted']:
         # unrestricted case
         mo_energies = np.concatenate((data['mo_a_occ'], data['mo_a_vir'],
                                       data['mo_b_occ'], data['mo_b_vir']), axis=0)
@@ -119,15 +152,21 @@ def load_one(lit: LineIterator) -> dict:
     return result
 
 
-def load_qchemlog_low(lit: LineIterator) -> dict:  # pylint: disable=too-many-branches
+def load_qchemlog_low(lit: LineIterator,  # pylint: disable=too-many-branches
+                      sections: Sequence[str] = None) -> dict:
     """Load the information from Q-Chem log file."""
+    if sections is None:
+        sections = list(SECTION_PREFIXES)
+    for name in sections:
+        if name not in SECTION_PREFIXES:
+            raise ValueError("Unknown section: {}".format(name))
+    prefixes = [re.escape(prefix) for name in set(sections) | set(REQUIRED_SECTIONS)
+                for prefix in SECTION_PREFIXES[name]]
     data = {}
-    while True:
-        try:
-            line = next(lit).strip()
-        except StopIteration:
-            # Read until the end of the file.
-            break
+    # Only the first lines of the requested sections are located in the file,
+    # such that all other lines are skipped without further processing.
+    for line in lit.scan(r'[ \t]*(?:{})'.format('|'.join(prefixes))):
+        line = line.strip()
 
         # job specifications
         if line.startswith('$rem') and 'run_type' not in data:
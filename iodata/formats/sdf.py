@@ -103,6 +103,35 @@ def load_many(lit: LineIterator) -> Iterator[dict]:
             return
 
 
+def skip_one(lit: LineIterator):
+    """Skip one SDF molecule without parsing the atom and bond lines.
+
+    Parameters
+    ----------
+    lit
+        The line iterator to read the data from.
+
+    Raises
+    ------
+    StopIteration
+        When no molecule is left.
+
+    """
+    # Skip the title and the two comment lines.
+    next(lit)
+    next(lit)
+    next(lit)
+    words = next(lit).split()
+    lit.skip_lines(int(words[0]) + int(words[1]))
+    while True:
+        try:
+            line = next(lit)
+        except StopIteration:
+            lit.error("Molecule specification did not end properly with $$$$")
+        if line == "$$$$\n":
+            break
+
+
 @document_dump_one("SDF", ['atcoords', 'atnums'], ['title', 'bonds'])
 def dump_one(f: TextIO, data: IOData):
     """Do not edit this docstring. It will be overwritten."""
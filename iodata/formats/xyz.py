@@ -51,9 +51,23 @@ atomic forces.
 When defining ``atom_columns``, no columns can be skipped, such that all
 information loaded from a file can also be written back out when dumping it.
 
+The atom lines of a frame are converted column by column. When a **load_word**
+function has an entry in ``LOAD_WORD_ARRAYS``, all words of that column are
+converted with a single call to the registered function, which takes a list of
+strings and returns an array. Other **load_word** functions, like the lambda
+functions above, still work but are called once for every word.
+
+Similarly, each frame is written with a single call. Columns whose **dump_word**
+is the ``format`` method of a string with one replacement field, like
+``"{:10.5f}".format``, or whose **dump_word** has an entry in
+``DUMP_WORD_ARRAYS``, are formatted in bulk. Other **dump_word** functions are
+called once for every value.
+
 """
 
-from typing import TextIO, Iterator
+from itertools import chain
+from string import Formatter
+from typing import TextIO, Iterator, List, Tuple
 
 import numpy as np
 
@@ -70,16 +84,61 @@ __all__ = []
 PATTERNS = ['*.xyz']
 
 
+def load_atnum_word(word: str) -> int:
+    """Convert an atomic number or an element symbol to an atomic number."""
+    return int(word) if word.isdigit() else sym2num[word.title()]
+
+
+def load_atnum_words(words: List[str]) -> np.ndarray:
+    """Convert a list of atomic numbers or element symbols to atomic numbers."""
+    # Only the few distinct words need to be looked up.
+    atnums = {word: load_atnum_word(word) for word in set(words)}
+    return np.array([atnums[word] for word in words], dtype=int)
+
+
+def load_angstrom_word(word: str) -> float:
+    """Convert a length in Angstrom to atomic units."""
+    return float(word) * angstrom
+
+
+def load_angstrom_words(words: List[str]) -> np.ndarray:
+    """Convert a list of lengths in Angstrom to atomic units."""
+    return np.array(words, dtype=float) * angstrom
+
+
+def dump_atnum_word(atnum: int) -> str:
+    """Convert an atomic number to an element symbol."""
+    return "{:2s}".format(num2sym[atnum])
+
+
+def dump_angstrom_word(value: float) -> str:
+    """Convert a length in atomic units to Angstrom."""
+    return "{:15.10f}".format(value / angstrom)
+
+
 DEFAULT_ATOM_COLUMNS = [
-    ("atnums", None, (), int,
-     (lambda word: int(word) if word.isdigit() else sym2num[word.title()]),
-     (lambda atnum: "{:2s}".format(num2sym[atnum]))),
-    ("atcoords", None, (3,), float,
-     (lambda word: float(word) * angstrom),
-     (lambda value: "{:15.10f}".format(value / angstrom)))
+    ("atnums", None, (), int, load_atnum_word, dump_atnum_word),
+    ("atcoords", None, (3,), float, load_angstrom_word, dump_angstrom_word),
 ]
 
 
+LOAD_WORD_ARRAYS = {
+    float: (lambda words: np.array(words, dtype=float)),
+    int: (lambda words: np.array(words, dtype=int)),
+    str: np.array,
+    load_atnum_word: load_atnum_words,
+    load_angstrom_word: load_angstrom_words,
+}
+
+
+# Each value is a function converting an array of values into a sequence of
+# values to be formatted, and the format string for one value.
+DUMP_WORD_ARRAYS = {
+    dump_atnum_word: ((lambda atnums: [num2sym[atnum] for atnum in atnums]), "{:2s}"),
+    dump_angstrom_word: ((lambda values: values / angstrom), "{:15.10f}"),
+}
+
+
 ATOM_COLUMNS_DOC = """\
 A list of atomic fields to be loaded. Each field as a tuple with the following
 items: **attribute** (``str``), **key** (``None`` or ``str``, when ``str`` the
@@ -90,51 +149,102 @@ string).
 """
 
 
-@document_load_one("XYZ", ['atcoords', 'atnums', 'title'],
-                   [], {"atom_columns": ATOM_COLUMNS_DOC})
-def load_one(lit: LineIterator, atom_columns=None) -> dict:
-    """Do not edit this docstring. It will be overwritten."""
-    # Load the header.
-    natom = int(next(lit))
-    title = next(lit).strip()
-    if atom_columns is None:
-        atom_columns = DEFAULT_ATOM_COLUMNS
-    data = {'title': title}
-    # Initialize the arrays to be loaded from the XYZ file.
-    for attrname, keyname, shapesuffix, dtype, _loadword, _dumpword in atom_columns:
-        array = np.zeros((natom,) + shapesuffix, dtype=dtype)
+def _compile_atom_columns(atom_columns, load_word_arrays: dict = None) -> Tuple[list, int]:
+    """Prepare the conversion of the atom lines, column by column.
+
+    Parameters
+    ----------
+    atom_columns
+        The list of atomic fields, see ``ATOM_COLUMNS_DOC``.
+    load_word_arrays
+        The bulk conversion functions for known **load_word** functions. When
+        not given, ``LOAD_WORD_ARRAYS`` is used.
+
+    Returns
+    -------
+    plan
+        For each field: the attribute, the key, the shape for one atom, the
+        dtype, the index of the first column, the number of columns and a
+        function converting a list of words to an array.
+    ncol
+        The total number of columns needed on each atom line.
+
+    """
+    if load_word_arrays is None:
+        load_word_arrays = LOAD_WORD_ARRAYS
+    plan = []
+    begin = 0
+    for attrname, keyname, shapesuffix, dtype, loadword, _dumpword in atom_columns:
+        loadwords = load_word_arrays.get(loadword)
+        if loadwords is None:
+            # Slow fallback for arbitrary functions.
+            def loadwords(words, loadword=loadword, dtype=dtype):
+                return np.array([loadword(word) for word in words], dtype=dtype)
+        size = int(np.prod(shapesuffix))
+        plan.append((attrname, keyname, shapesuffix, dtype, begin, size, loadwords))
+        begin += size
+    return plan, begin
+
+
+def _load_atom_lines(lit: LineIterator, natom: int, atom_plan: Tuple[list, int]) -> dict:
+    """Load the atom lines of one frame with a plan from ``_compile_atom_columns``."""
+    plan, ncol = atom_plan
+    words = []
+    for iatom, line in enumerate(lit.read_lines(natom)):
+        line_words = line.split()
+        if len(line_words) < ncol:
+            lit.error("Expected at least {} words on the line of atom {}, found {}.".format(
+                ncol, iatom, len(line_words)))
+        # Words beyond the needed columns are ignored.
+        words.extend(line_words[:ncol])
+    data = {}
+    for attrname, keyname, shapesuffix, dtype, begin, size, loadwords in plan:
+        # The words of the columns, atom by atom, sliced from the flat list of words.
+        if size == 1:
+            column_words = words[begin::ncol]
+        else:
+            column_words = list(chain.from_iterable(
+                zip(*(words[begin + k::ncol] for k in range(size)))))
+        array = np.asarray(loadwords(column_words), dtype=dtype)
+        array = array.reshape((natom,) + shapesuffix)
         if keyname is None:
-            # Store the initial array as a normal attribute.
+            # Store the array as a normal attribute.
             data[attrname] = array
         else:
-            # Store the initial array as a value in an dictionary attribute.
+            # Store the array as a value in an dictionary attribute.
             data.setdefault(attrname, {})[keyname] = array
+    return data
+
+
+def _load_frame(lit: LineIterator, atom_plan: Tuple[list, int]) -> dict:
+    """Load one XYZ frame with a plan from ``_compile_atom_columns``."""
+    # Load the header.
+    natom = int(next(lit))
+    title = next(lit).strip()
+    data = {'title': title}
     # Load the atom lines.
-    for iatom in range(natom):
-        words = next(lit).split()
-        for attrname, keyname, _shapesuffix, _dtype, loadword, _dumpword in atom_columns:
-            # Get the slice of the array where properties for the current atom
-            # must be stored.
-            if keyname is None:
-                # The array is a normal attribute.
-                atom_array = data[attrname][iatom: iatom + 1]
-            else:
-                # The array is a value of a dictionary attribute.
-                atom_array = data[attrname][keyname][iatom: iatom + 1]
-            # Fill in array elements with atomic properties. For each new value
-            # to be loaded, the first element of the list words is consumed and
-            # converted to the right format for IOData.
-            for ifield in range(atom_array.size):
-                atom_array.flat[ifield] = loadword(words.pop(0))
+    data.update(_load_atom_lines(lit, natom, atom_plan))
     return data
 
 
+@document_load_one("XYZ", ['atcoords', 'atnums', 'title'],
+                   [], {"atom_columns": ATOM_COLUMNS_DOC})
+def load_one(lit: LineIterator, atom_columns=None) -> dict:
+    """Do not edit this docstring. It will be overwritten."""
+    if atom_columns is None:
+        atom_columns = DEFAULT_ATOM_COLUMNS
+    return _load_frame(lit, _compile_atom_columns(atom_columns))
+
+
 @document_load_many("XYZ", ['atcoords', 'atnums', 'title'],
                     [], {"atom_columns": ATOM_COLUMNS_DOC})
 def load_many(lit: LineIterator, atom_columns=None) -> Iterator[dict]:
     """Do not edit this docstring. It will be overwritten."""
     # XYZ Trajectory files are a simple concatenation of individual XYZ files,'
     # making it trivial to load many frames.
+    if atom_columns is None:
+        atom_columns = DEFAULT_ATOM_COLUMNS
+    atom_plan = _compile_atom_columns(atom_columns)
     while True:
         try:
             # Check for and skip empty lines at the end of file
@@ -142,31 +252,140 @@ def load_many(lit: LineIterator, atom_columns=None) -> Iterator[dict]:
             if line.strip() == "":
                 return
             lit.back(line)
-            yield load_one(lit, atom_columns)
+            yield _load_frame(lit, atom_plan)
         except StopIteration:
             return
 
 
+def skip_one(lit: LineIterator):
+    """Skip one XYZ frame without parsing it.
+
+    Parameters
+    ----------
+    lit
+        The line iterator to read the data from.
+
+    Raises
+    ------
+    StopIteration
+        When no complete frame is left. Like in ``load_many``, empty lines at
+        the end of the file are ignored.
+
+    """
+    line = next(lit)
+    if line.strip() == "":
+        raise StopIteration
+    if not line.strip().isdigit():
+        lit.error("Expected the number of atoms at the start of a frame.")
+    # Skip the title and atom lines.
+    lit.skip_lines(int(line) + 1)
+
+
+def index_many(lit: LineIterator) -> Iterator[Tuple[int, int]]:
+    """Locate the frames in an XYZ trajectory without parsing them.
+
+    Parameters
+    ----------
+    lit
+        The line iterator to read the data from.
+
+    Yields
+    ------
+    offset
+        The byte offset of the atom-count line of a frame.
+    lineno
+        The number of lines preceding that offset.
+
+    Notes
+    -----
+    Each frame can be loaded by seeking the line iterator to its location and calling
+    ``load_one``. This is what :func:`iodata.api.load_frames` does.
+
+    """
+    while True:
+        offset, lineno = lit.tell(), lit.lineno
+        try:
+            skip_one(lit)
+        except StopIteration:
+            return
+        yield offset, lineno
+
+
+def _compile_dump_columns(atom_columns) -> Tuple[list, str]:
+    """Prepare the formatting of the atom lines, column by column.
+
+    Parameters
+    ----------
+    atom_columns
+        The list of atomic fields, see ``ATOM_COLUMNS_DOC``.
+
+    Returns
+    -------
+    plan
+        For each field: the attribute, the key, the index of the first column,
+        the number of columns and a function converting a flat array of values
+        into a sequence of values to be formatted.
+    line_format
+        The format string for one atom line.
+
+    """
+    plan = []
+    formats = []
+    begin = 0
+    for attrname, keyname, shapesuffix, _dtype, _loadword, dumpword in atom_columns:
+        size = int(np.prod(shapesuffix))
+        if dumpword in DUMP_WORD_ARRAYS:
+            prepare, word_format = DUMP_WORD_ARRAYS[dumpword]
+        elif _is_format_method(dumpword):
+            prepare, word_format = None, dumpword.__self__
+        else:
+            # Slow fallback for arbitrary functions.
+            def prepare(values, dumpword=dumpword):
+                return [dumpword(value) for value in values]
+            word_format = "{}"
+        plan.append((attrname, keyname, begin, size, prepare))
+        formats.extend([word_format] * size)
+        begin += size
+    return plan, " ".join(formats) + "\n"
+
+
+def _is_format_method(dumpword) -> bool:
+    """Return True if dumpword is the format method of a string with one replacement field."""
+    template = getattr(dumpword, "__self__", None)
+    if not (isinstance(template, str) and dumpword == template.format):
+        return False
+    fields = [field for _literal, field, _spec, _conversion in Formatter().parse(template)
+              if field is not None]
+    return fields == [""]
+
+
+def _dump_frame(f: TextIO, data: IOData, dump_plan: Tuple[list, str]):
+    """Write one XYZ frame with a plan from ``_compile_dump_columns``."""
+    plan, line_format = dump_plan
+    natom = data.natom
+    # A table of all values to be formatted, with one row per atom.
+    table = np.empty((natom, sum(entry[3] for entry in plan)), dtype=object)
+    for attrname, keyname, begin, size, prepare in plan:
+        values = getattr(data, attrname)
+        if keyname is not None:
+            # The data to be written is a value of a dictionary attribute.
+            values = values[keyname]
+        values = np.asarray(values).reshape(natom * size)
+        if prepare is not None:
+            values = prepare(values)
+        table[:, begin:begin + size] = np.array(values, dtype=object).reshape(natom, size)
+    # Write the header and the atom lines
+    f.write("{}\n{}\n".format(natom, data.title or 'Created with IOData')
+            + (line_format * natom).format(*table.ravel().tolist()))
+
+
 @document_dump_one("XYZ", ['atcoords', 'atnums'], ['title'],
                    {"atom_columns": ATOM_COLUMNS_DOC})
 def dump_one(f: TextIO, data: IOData, atom_columns=None):
     """Do not edit this docstring. It will be overwritten."""
     if atom_columns is None:
         atom_columns = DEFAULT_ATOM_COLUMNS
-    # Write the header
-    print(data.natom, file=f)
-    print(data.title or 'Created with IOData', file=f)
-    # Write the atom lines
-    for iatom in range(data.natom):
-        words = []
-        for attrname, keyname, _shapesuffix, _dtype, _loadword, dumpword in atom_columns:
-            values = getattr(data, attrname)
-            if keyname is not None:
-                # The data to be written is a value of a dictionary attribute.
-                values = values[keyname]
-            for value in values[iatom].flat:
-                words.append(dumpword(value))
-        print(" ".join(words), file=f)
+    _dump_frame(f, data, _compile_dump_columns(atom_columns))
 
 
 @document_dump_many("XYZ", ['atcoords', 'atnums'], ['title'],
@@ -174,5 +393,8 @@ def dump_one(f: TextIO, data: IOData, atom_columns=None):
 def dump_many(f: TextIO, datas: Iterator[IOData], atom_columns=None):
     """Do not edit this docstring. It will be overwritten."""
     # Similar to load_many, this is relatively easy.
+    if atom_columns is None:
+        atom_columns = DEFAULT_ATOM_COLUMNS
+    dump_plan = _compile_dump_columns(atom_columns)
     for data in datas:
-        dump_one(f, data, atom_columns)
+        _dump_frame(f, data, dump_plan)
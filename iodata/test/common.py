@@ -196,3 +196,22 @@ def load_one_warning(filename: str, fmt: str = None, match: str = None, **kwargs
             return load_one(str(fn), fmt, **kwargs)
         with pytest.warns(FileFormatWarning, match=match):
             return load_one(str(fn), fmt, **kwargs)
+
+
+class CountingReader:
+    """Wrap a binary file and count the bytes read from it."""
+
+    def __init__(self, f):
+        self.f = f
+        self.nread = 0
+
+    def read(self, size):
+        data = self.f.read(size)
+        self.nread += len(data)
+        return data
+
+    def seek(self, offset):
+        self.f.seek(offset)
+
+    def close(self):
+        self.f.close()
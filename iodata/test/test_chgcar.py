@@ -20,6 +20,7 @@
 """Test iodata.formats.chgcar module."""
 
 import numpy as np
+import pytest
 from numpy.testing import assert_equal, assert_allclose
 
 from ..api import load_one
@@ -57,3 +58,57 @@ def test_load_chgcar_water():
     assert_equal(mol.cube.shape, (3, 3, 3))
     assert_allclose(mol.cube.axes, mol.cellvecs / 3, atol=1.e-10)
     assert abs(mol.cube.origin).max() < 1e-10
+
+
+def test_load_chgcar_water_lazy():
+    with path('iodata.test.data', 'CHGCAR.water') as fn:
+        mol1 = load_one(str(fn))
+        mol2 = load_one(str(fn), lazy=True)
+    assert_equal(mol2.cube.shape, (3, 3, 3))
+    assert_allclose(mol2.cube.data[:, 1, :], mol1.cube.data[:, 1, :])
+    assert_allclose(np.asarray(mol2.cube.data), mol1.cube.data)
+
+
+def test_load_chgcar_water_region():
+    region = (slice(None, None, 2), slice(1, 3))
+    with path('iodata.test.data', 'CHGCAR.water') as fn:
+        mol1 = load_one(str(fn))
+        mol2 = load_one(str(fn), region=region)
+    assert_equal(mol2.cube.shape, (2, 2, 3))
+    assert_allclose(mol2.cube.data, mol1.cube.data[region])
+    assert_allclose(mol2.cube.origin, mol1.cube.axes[1])
+    assert_allclose(mol2.cube.axes[0], 2 * mol1.cube.axes[0])
+
+
+def test_load_chgcar_oxygen_magnetization():
+    with path('iodata.test.data', 'CHGCAR.oxygen.spin') as fn:
+        mol = load_one(str(fn), magnetization=True)
+    vol = volume(mol.cellvecs)
+    assert_equal(mol.cube.shape, [2, 2, 2])
+    assert_allclose(mol.cube.data[-1, -1, -1], 0.10024522914E+04 / vol, atol=1.e-10)
+    cube = mol.extra['magnetization']
+    assert_equal(cube.shape, [2, 2, 2])
+    assert_allclose(cube.axes, mol.cube.axes)
+    assert_allclose(cube.data[0, 0, 0], 0.16230587421E+04 / vol, atol=1.e-10)
+    assert_allclose(cube.data[1, 0, 0], 0.15310672831E+04 / vol, atol=1.e-10)
+    assert_allclose(cube.data[-1, -1, -1], 0.56102983714E+02 / vol, atol=1.e-10)
+
+
+def test_load_chgcar_oxygen_magnetization_lazy():
+    region = (slice(1, 2), slice(None), slice(None, None, -1))
+    with path('iodata.test.data', 'CHGCAR.oxygen.spin') as fn:
+        mol1 = load_one(str(fn), magnetization=True)
+        mol2 = load_one(str(fn), magnetization=True, lazy=True)
+        mol3 = load_one(str(fn), magnetization=True, region=region[:2])
+    assert_allclose(np.asarray(mol2.extra['magnetization'].data),
+                    mol1.extra['magnetization'].data)
+    assert_allclose(mol2.extra['magnetization'].data[region],
+                    mol1.extra['magnetization'].data[region])
+    assert_allclose(mol3.extra['magnetization'].data,
+                    mol1.extra['magnetization'].data[region[:2]])
+
+
+def test_load_chgcar_no_magnetization():
+    with path('iodata.test.data', 'CHGCAR.oxygen') as fn:
+        with pytest.raises(IOError, match="No magnetization density found."):
+            load_one(str(fn), magnetization=True)
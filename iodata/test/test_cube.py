@@ -23,7 +23,10 @@
 import numpy as np
 from numpy.testing import assert_equal, assert_allclose
 
+import pytest
+
 from ..api import load_one, dump_one
+from ..utils import LazyCubeData
 
 try:
     from importlib_resources import path
@@ -136,3 +139,47 @@ def test_load_dump_nh3_7points(tmpdir):
         content1 = f.read().split("\n", 2)[-1]
     content2 = fn_cube2.read().split("\n", 2)[-1]
     assert content1 == content2
+
+
+def test_load_corrupt_data(tmpdir):
+    with path('iodata.test.data', 'aelta.cube') as fn_cube:
+        with open(fn_cube) as f:
+            lines = f.readlines()
+    fn_corrupt = str(tmpdir.join('corrupt.cube'))
+    # Corrupt a number in the volumetric data.
+    lines[99] = lines[99].replace('e', 'x', 1)
+    with open(fn_corrupt, 'w') as f:
+        f.writelines(lines)
+    with pytest.raises(IOError, match=r'corrupt.cube:100 Could not interpret'):
+        load_one(fn_corrupt)
+    # Truncate the volumetric data.
+    with open(fn_corrupt, 'w') as f:
+        f.writelines(lines[:99])
+    with pytest.raises(IOError, match='File ended before all data was read.'):
+        load_one(fn_corrupt)
+
+
+def test_load_aelta_lazy():
+    with path('iodata.test.data', 'aelta.cube') as fn_cube:
+        mol1 = load_one(str(fn_cube))
+        mol2 = load_one(str(fn_cube), lazy=True)
+    assert isinstance(mol2.cube.data, LazyCubeData)
+    assert_equal(mol2.cube.shape, (12, 12, 12))
+    assert_allclose(mol2.cube.data[3, :, 5], mol1.cube.data[3, :, 5])
+    assert_allclose(np.asarray(mol2.cube.data), mol1.cube.data)
+
+
+def test_load_aelta_region():
+    region = (slice(2, 10, 3), slice(None, None, -1), slice(1, 5))
+    with path('iodata.test.data', 'aelta.cube') as fn_cube:
+        mol1 = load_one(str(fn_cube))
+        mol2 = load_one(str(fn_cube), region=region)
+        with pytest.raises(TypeError):
+            load_one(str(fn_cube), region=(1, slice(None)))
+        with pytest.raises(ValueError):
+            load_one(str(fn_cube), lazy=True, region=region)
+    assert_allclose(mol2.cube.data, mol1.cube.data[region])
+    axes = mol1.cube.axes
+    assert_allclose(mol2.cube.origin, mol1.cube.origin + 2 * axes[0] + 11 * axes[1] + axes[2])
+    assert_allclose(mol2.cube.axes, axes * [[3], [-1], [1]])
+    assert_allclose(mol2.cellvecs, mol1.cellvecs)
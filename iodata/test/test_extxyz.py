@@ -18,11 +18,18 @@
 # --
 """Test iodata.formats.extxyz module."""
 
+import os
+import shlex
+import shutil
+
 import numpy as np
 from numpy.testing import assert_equal, assert_allclose
+import pytest
 
-from ..api import load_one, load_many
-from ..utils import angstrom
+from ..api import load_one, load_many, load_frames
+from ..formats import xyz
+from ..formats.extxyz import _split_title, LOAD_WORD_ARRAYS, load_amu_word
+from ..utils import angstrom, FileFormatError
 try:
     from importlib_resources import path
 except ImportError:
@@ -80,3 +87,42 @@ def test_load_many_extended():
     assert hasattr(mols[2], 'atmasses')
     assert mols[2].atmasses.dtype == float
     assert_allclose(mols[2].atmasses, np.array([29164.39290107, 1837.47159474, 1837.47159474]))
+
+
+def test_load_frames_extended(tmpdir):
+    fn_xyz = os.path.join(tmpdir, 'water_extended_trajectory.xyz')
+    with path('iodata.test.data', 'water_extended_trajectory.xyz') as fn:
+        shutil.copy(str(fn), fn_xyz)
+    mols0 = list(load_many(fn_xyz, fmt='extxyz'))
+    mols1 = list(load_frames(fn_xyz, slice(-1, 0, -1), fmt='extxyz'))
+    assert len(mols1) == len(mols0) - 1
+    for mol0, mol1 in zip(mols0[::-1], mols1):
+        assert mol1.title == mol0.title
+        assert mol1.extra.keys() == mol0.extra.keys()
+        assert_equal(mol1.atnums, mol0.atnums)
+        assert_allclose(mol1.atcoords, mol0.atcoords)
+
+
+@pytest.mark.parametrize("title", [
+    'Lattice="7.6 0 0 0 7.6 0 0 0 7.6" Properties=species:S:1:pos:R:3 pbc="T F T"',
+    "Properties=species:S:1:pos:R:3 energy=-1.5 is_true",
+    "comment='it is' name=\"it's\" empty='' mixed=a'b c'd",
+    'escaped="a \\"b\\" c"',
+])
+def test_split_title(title):
+    assert _split_title(title) == shlex.split(title)
+
+
+def test_load_no_properties(tmpdir):
+    fn_xyz = os.path.join(tmpdir, 'no_properties.xyz')
+    with open(fn_xyz, 'w') as f:
+        f.write('1\nenergy=-0.5\nH 0.0 0.0 0.0\n')
+    with pytest.raises(FileFormatError):
+        load_one(fn_xyz, fmt='extxyz')
+
+
+def test_load_word_arrays():
+    # The extra conversions of extxyz do not leak into the xyz format.
+    assert load_amu_word in LOAD_WORD_ARRAYS
+    assert load_amu_word not in xyz.LOAD_WORD_ARRAYS
+    assert set(xyz.LOAD_WORD_ARRAYS) < set(LOAD_WORD_ARRAYS)
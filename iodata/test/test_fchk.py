@@ -28,8 +28,9 @@ from numpy.testing import assert_equal, assert_allclose
 import pytest
 
 from ..api import load_one, load_many, dump_one
+from ..formats.fchk import _load_fchk_low
 from ..overlap import compute_overlap
-from ..utils import check_dm
+from ..utils import check_dm, LineIterator
 
 from .common import check_orthonormal, compare_mols, load_one_warning, compute_1rdm
 from .test_molekel import compare_mols_diff_formats
@@ -46,6 +47,18 @@ def test_load_fchk_nonexistent():
             load_one(str(fn))
 
 
+def test_load_fchk_corrupt_array(tmpdir):
+    with path('iodata.test.data', 'hf_sto3g.fchk') as fn:
+        with open(fn) as f:
+            lines = f.readlines()
+    lines[22] = lines[22].replace('-1.71435955E+00', '-1.71435955Q+00')
+    fn_corrupt = os.path.join(tmpdir, 'corrupt.fchk')
+    with open(fn_corrupt, 'w') as f:
+        f.writelines(lines)
+    with pytest.raises(IOError, match=r'corrupt.fchk:23 Could not interpret: -1.71435955Q\+00'):
+        load_one(fn_corrupt)
+
+
 def load_fchk_helper(fn_fchk):
     """Load a testing fchk file with iodata.iodata.load_one."""
     with path('iodata.test.data', fn_fchk) as fn:
@@ -371,6 +384,96 @@ def test_load_water_hfs_321g():
                      -2.51606382E-01])  # zz
 
 
+def test_load_fchk_lazy(tmpdir):
+    with path('iodata.test.data', 'water_hfs_321g.fchk') as fn:
+        mol1 = load_one(str(fn))
+        with open(fn) as f:
+            content = f.read()
+    fn_copy = os.path.join(tmpdir, 'water_hfs_321g.fchk')
+    with open(fn_copy, 'w') as f:
+        f.write(content)
+    mol2 = load_one(fn_copy, lazy=True)
+    assert repr(mol2.one_rdms) == "{'scf': <not loaded>}"
+    assert sorted(mol2.one_rdms) == sorted(mol1.one_rdms)
+    assert_allclose(mol2.one_rdms['scf'], mol1.one_rdms['scf'])
+    assert_allclose(mol2.extra['polarizability_tensor'], mol1.extra['polarizability_tensor'])
+    assert_allclose(mol2.moments[(2, 'c')], mol1.moments[(2, 'c')])
+    assert_allclose(mol2.atcharges['mulliken'], mol1.atcharges['mulliken'])
+    # Values that are not loaded yet can no longer be read after a change of the file.
+    mol3 = load_one(fn_copy, lazy=True)
+    with open(fn_copy, 'a') as f:
+        f.write('\n')
+    with pytest.raises(IOError, match='File changed after it was indexed.'):
+        mol3.one_rdms['scf']
+
+
+def test_load_fchk_fields_one_reader():
+    # All array fields are read with the line iterator used for indexing.
+    with path('iodata.test.data', 'water_hfs_321g.fchk') as fn:
+        lit = LineIterator(str(fn))
+        fchk = _load_fchk_low(lit, ['Atomic numbers', 'Total *', 'Nuclear charges'])
+        assert sorted(fchk) == [
+            'Atomic numbers', 'Nuclear charges', 'Total Energy', 'Total SCF Density',
+            'command', 'lot', 'obasis_name', 'title']
+        location = fchk.fields['Atomic numbers']
+        assert_equal(fchk['Atomic numbers'], [1, 8, 1])
+        assert lit.lineno == location.lineno + 1
+        assert_equal(fchk['Nuclear charges'], [1.0, 8.0, 1.0])
+
+
+def test_load_fchk_sidecar(tmpdir):
+    with path('iodata.test.data', 'peroxide_irc.fchk') as fn:
+        mol1 = load_one(str(fn))
+        with open(fn) as f:
+            content = f.read()
+    fn_copy = os.path.join(tmpdir, 'peroxide_irc.fchk')
+    with open(fn_copy, 'w') as f:
+        f.write(content)
+    fn_sidecar = fn_copy + '.index.json'
+    mol2 = load_one(fn_copy, sidecar=True)
+    assert os.path.isfile(fn_sidecar)
+    compare_mols(mol1, mol2)
+    # Modify the sidecar to check that it is used.
+    with open(fn_sidecar) as f:
+        sidecar = f.read()
+    with open(fn_sidecar, 'w') as f:
+        f.write(sidecar.replace('"title": "', '"title": "indexed '))
+    mol3 = load_one(fn_copy, sidecar=True)
+    assert mol3.title == 'indexed ' + mol1.title
+    assert_allclose(mol3.mo.coeffs, mol1.mo.coeffs)
+    # The sidecar contains all fields, such that alternating with load_many does
+    # not rewrite it.
+    with open(fn_sidecar) as f:
+        sidecar = f.read()
+    assert '"IRC Number of geometries"' in sidecar
+    assert '"Alpha MO coefficients"' in sidecar
+    for _ in range(2):
+        assert len(list(load_many(fn_copy, sidecar=True))) == 21
+        assert load_one(fn_copy, sidecar=True).title == 'indexed ' + mol1.title
+        with open(fn_sidecar) as f:
+            assert f.read() == sidecar
+    # After changing the FCHK file, the sidecar is rewritten.
+    with open(fn_copy, 'a') as f:
+        f.write('\n')
+    mol4 = load_one(fn_copy, sidecar=True)
+    assert mol4.title == mol1.title
+    with open(fn_sidecar) as f:
+        assert f.read() != sidecar
+
+
+def test_load_fchk_no_orbitals():
+    with path('iodata.test.data', 'ch3_rohf_sto3g_g03.fchk') as fn:
+        mol1 = load_one(str(fn))
+        mol2 = load_one(str(fn), orbitals=False)
+    assert mol2.mo is None
+    assert mol2.obasis.nbasis == mol1.obasis.nbasis
+    assert_allclose(mol2.atcoords, mol1.atcoords)
+    assert mol2.nelec == mol1.nelec
+    assert mol2.charge == mol1.charge
+    assert mol2.spinpol == mol1.spinpol
+    assert sorted(mol2.one_rdms) == sorted(mol1.one_rdms)
+
+
 def test_load_monosilicic_acid_hf_lan():
     mol = load_fchk_helper('monosilicic_acid_hf_lan.fchk')
     assert_allclose(mol.moments[(1, 'c')],
@@ -21,9 +21,11 @@
 import os
 
 import numpy as np
+import pytest
 from numpy.testing import assert_equal, assert_allclose
 
 from ..api import load_one, dump_one
+from ..utils import PackedFourIndex, set_four_index_element
 
 try:
     from importlib_resources import path
@@ -106,3 +108,82 @@ def test_dump_load_fcidimp_consistency_ao(tmpdir):
     assert_equal(mol0.spinpol, mol1.spinpol)
     assert_allclose(mol0.one_ints['core_mo'], mol1.one_ints['core_mo'])
     assert_allclose(mol0.two_ints['two_mo'], mol1.two_ints['two_mo'])
+
+
+def test_load_fcidump_packed(tmpdir):
+    with path('iodata.test.data', 'FCIDUMP.psi4.h2') as fn:
+        mol1 = load_one(str(fn))
+        mol2 = load_one(str(fn), packed=True)
+    two_mo = mol2.two_ints['two_mo']
+    assert isinstance(two_mo, PackedFourIndex)
+    assert two_mo.shape == (10, 10, 10, 10)
+    assert two_mo.packed.shape == (1540,)
+    assert_allclose(two_mo[6, 1, 5, 0], 0.5335846565304321E-01)
+    assert_allclose(two_mo[0, 5, 1, 6], 0.5335846565304321E-01)
+    assert_allclose(two_mo[:, 3, 1:7], mol1.two_ints['two_mo'][:, 3, 1:7])
+    assert_allclose(two_mo, mol1.two_ints['two_mo'])
+    # Dumping from the packed form must give the same file.
+    fn1 = os.path.join(tmpdir, 'FCIDUMP1')
+    fn2 = os.path.join(tmpdir, 'FCIDUMP2')
+    dump_one(mol1, fn1)
+    dump_one(mol2, fn2)
+    with open(fn1) as f1, open(fn2) as f2:
+        assert f1.read() == f2.read()
+
+
+def test_load_fcidump_errors(tmpdir):
+    fn = os.path.join(tmpdir, 'FCIDUMP')
+    with path('iodata.test.data', 'FCIDUMP.molpro.h2') as fn_orig:
+        with open(fn_orig) as f:
+            lines = f.readlines()
+    with open(fn, 'w') as f:
+        f.writelines(lines[:6] + [' 0.5 1 1\n'] + lines[6:])
+    with pytest.raises(IOError, match='FCIDUMP:7 Expecting 5 fields'):
+        load_one(fn)
+    with open(fn, 'w') as f:
+        f.writelines(lines[:6] + [' 0.5 1 x 1 1\n'] + lines[6:])
+    with pytest.raises(IOError, match='FCIDUMP:7 Could not interpret data line'):
+        load_one(fn)
+
+
+def test_load_fcidump_duplicates(tmpdir):
+    fn = os.path.join(tmpdir, 'FCIDUMP')
+    with path('iodata.test.data', 'FCIDUMP.molpro.h2') as fn_orig:
+        with open(fn_orig) as f:
+            lines = f.readlines()
+    # Two symmetry-equivalent duplicates, the last one is kept.
+    with open(fn, 'w') as f:
+        f.writelines(lines[:6] + [' 0.25 1 2 1 1\n', ' 0.75 2 1 1 1\n'] + lines[6:])
+    two_mo = load_one(fn).two_ints['two_mo']
+    assert_allclose(two_mo[1, 0, 0, 0], 0.75)
+    assert_allclose(two_mo[0, 0, 1, 0], 0.75)
+    assert_allclose(two_mo, two_mo.transpose(1, 0, 3, 2))
+    assert_allclose(two_mo, two_mo.transpose(2, 3, 0, 1))
+
+
+def test_dump_fcidump_threshold(tmpdir):
+    with path('iodata.test.data', 'FCIDUMP.psi4.h2') as fn:
+        mol0 = load_one(str(fn))
+    threshold = 1e-2
+    fn_tmp = os.path.join(tmpdir, 'FCIDUMP')
+    dump_one(mol0, fn_tmp, threshold=threshold)
+    mol1 = load_one(fn_tmp)
+    for ints in mol0.one_ints["core_mo"], mol0.two_ints["two_mo"]:
+        ints[abs(ints) <= threshold] = 0.0
+    assert_allclose(mol1.core_energy, mol0.core_energy)
+    assert_allclose(mol1.one_ints['core_mo'], mol0.one_ints['core_mo'])
+    assert_allclose(mol1.two_ints['two_mo'], mol0.two_ints['two_mo'])
+    assert (mol1.two_ints['two_mo'] == 0.0).any()
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_dump_fcidump_threshold_nan(tmpdir, packed):
+    with path('iodata.test.data', 'FCIDUMP.molpro.h2') as fn:
+        mol0 = load_one(str(fn), packed=packed)
+    mol0.one_ints['core_mo'][1, 0] = np.nan
+    set_four_index_element(mol0.two_ints['two_mo'], 1, 0, 0, 0, np.nan)
+    fn_tmp = os.path.join(tmpdir, 'FCIDUMP')
+    dump_one(mol0, fn_tmp, threshold=1e-2)
+    mol1 = load_one(fn_tmp)
+    assert np.isnan(mol1.one_ints['core_mo'][1, 0])
+    assert np.isnan(mol1.two_ints['two_mo'][1, 0, 0, 0])
@@ -18,9 +18,15 @@
 # --
 """Test iodata.formats.log module."""
 
+import os
+
+import numpy as np
 from numpy.testing import assert_equal, assert_allclose
+import pytest
 
-from ..api import load_one
+from ..api import load_one, load_many
+from ..formats import gaussianlog
+from ..utils import LineIterator, PackedFourIndex, SparseFourIndex, angstrom
 
 try:
     from importlib_resources import path
@@ -103,3 +109,74 @@ def test_load_operators_water_ccpvdz_pure_hf_g03():
     assert_allclose(er_ao[23, 23, 23, 23], 0.785718708997, atol=eps)
     assert_allclose(er_ao[23, 8, 23, 2], -0.0400337571969, atol=eps)
     assert_allclose(er_ao[15, 2, 12, 0], -0.0000308196281033, atol=eps)
+
+
+@pytest.mark.parametrize("storage", ['packed', 'sparse'])
+def test_load_operators_water_ccpvdz_pure_hf_g03_storage(storage):
+    mol1 = load_log_helper('water_ccpvdz_pure_hf_g03.log')
+    with path('iodata.test.data', 'water_ccpvdz_pure_hf_g03.log') as fn:
+        mol2 = load_one(fn, storage=storage)
+    er_ao = mol2.two_ints['er_ao']
+    assert isinstance(er_ao, SparseFourIndex if storage == 'sparse' else PackedFourIndex)
+    assert_equal(er_ao.shape, (24, 24, 24, 24))
+    assert_allclose(er_ao[23, 8, 23, 2], -0.0400337571969, atol=1e-5)
+    assert_allclose(er_ao[:, 3, 5:9], mol1.two_ints['er_ao'][:, 3, 5:9])
+    assert_allclose(np.asarray(er_ao), mol1.two_ints['er_ao'])
+    assert_allclose(mol2.one_ints['olp'], mol1.one_ints['olp'])
+
+
+def test_load_operators_unknown_storage():
+    with path('iodata.test.data', 'water_sto3g_hf_g03.log') as fn:
+        with pytest.raises(ValueError):
+            load_one(fn, storage='coo')
+
+
+@pytest.mark.parametrize("fn_log", ['water_opt_hf_sto3g_g16.log',
+                                    'water_opt_hf_sto3g_nosymm_g16.log'])
+def test_load_many_water_opt(fn_log):
+    with path('iodata.test.data', fn_log) as fn:
+        mols = list(load_many(fn))
+    # The same optimization is stored in the FCHK file, with the geometries and the
+    # gradients in the input orientation.
+    with path('iodata.test.data', 'h2o_sto3g.fchk') as fn:
+        steps = list(load_many(fn))
+    # No extra frame for the orientation printed after the optimization has converged.
+    assert len(mols) == len(steps) == 5
+    for mol, step in zip(mols, steps):
+        assert_equal(mol.atnums, [8, 1, 1])
+        assert_allclose(mol.atcoords, step.atcoords, atol=1e-6 * angstrom)
+        assert_allclose(mol.energy, step.energy, atol=1e-7)
+        assert_allclose(mol.atgradient, step.atgradient, atol=1e-9)
+    assert_allclose(mols[0].atcoords[1], [-1.361981 * angstrom, 1.842105 * angstrom, 0.0])
+    assert_allclose(mols[1].atgradient[0], [-0.007588532, -0.010737526, 0.0])
+    assert_allclose(mols[-1].energy, -74.9659012171)
+
+
+def test_load_many_water_opt_standard_orientation(tmpdir):
+    # Without input orientations, e.g. in a trimmed file, the standard ones are used.
+    with path('iodata.test.data', 'water_opt_hf_sto3g_g16.log') as fn:
+        with open(fn) as f:
+            lines = f.readlines()
+    fn_log = os.path.join(tmpdir, 'standard.log')
+    with open(fn_log, 'w') as f:
+        skip = 0
+        for line in lines:
+            if line.strip() == 'Input orientation:':
+                skip = 9
+            if skip > 0:
+                skip -= 1
+            else:
+                f.write(line)
+    mols = list(load_many(fn_log))
+    assert len(mols) == 5
+    assert_allclose(mols[0].atcoords[0], [0.0, 0.0, 0.110812 * angstrom])
+    assert_allclose(mols[-1].energy, -74.9659012171)
+
+
+def test_load_many_without_tell():
+    # The sections are located in a memory map, without counting lines with tell,
+    # which keeps large logs almost as fast as a plain loop over the lines.
+    with path('iodata.test.data', 'water_opt_hf_sto3g_g16.log') as fn_log:
+        lit = LineIterator(str(fn_log))
+        assert len(list(gaussianlog.load_many(lit))) == 5
+    assert lit._raw is None  # pylint: disable=protected-access
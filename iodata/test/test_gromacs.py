@@ -59,3 +59,11 @@ def test_load_many():
     assert mols[1].extra['time'] == 1.0 * picosecond
     for mol in mols:
         check_water(mol)
+
+
+def test_load_many_selection():
+    with path('iodata.test.data', 'water2.gro') as fn_gro:
+        mols = list(load_many(str(fn_gro), start=1))
+    assert len(mols) == 1
+    assert mols[0].extra['time'] == 1.0 * picosecond
+    check_water(mols[0])
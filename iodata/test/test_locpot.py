@@ -43,3 +43,12 @@ def test_load_locpot_oxygen():
     assert_allclose(d[0, 1, 0] / electronvolt, 0.213732132354E+01, 1.e-10)
     assert_allclose(d[0, 2, 0] / electronvolt, -.65465465497E+01, 1.e-10)
     assert_allclose(d[0, 2, 1] / electronvolt, -.546876467887E+01, 1.e-10)
+
+
+def test_load_locpot_oxygen_lazy():
+    with path('iodata.test.data', 'LOCPOT.oxygen') as fn:
+        mol1 = load_one(str(fn))
+        mol2 = load_one(str(fn), lazy=True)
+    assert_equal(mol2.cube.shape, [1, 4, 2])
+    assert_allclose(mol2.cube.data[0, 2], mol1.cube.data[0, 2])
+    assert_allclose(mol2.cube.data[:, :, :], mol1.cube.data)
@@ -22,8 +22,9 @@
 import numpy as np
 from numpy.testing import assert_equal, assert_allclose
 
-from ..api import load_one
-from ..utils import angstrom
+from ..api import load_one, load_many
+from ..formats import orcalog
+from ..utils import LineIterator, angstrom
 
 try:
     from importlib_resources import path
@@ -51,3 +52,50 @@ def test_load_water_number():
     assert_allclose(mol.energy, -76.347791524303, atol=1e-8)
     # check dipole moment
     assert_allclose(mol.moments[(1, 'c')], [0.76499, 0.00000, 0.54230])
+
+
+def test_load_many_water_opt():
+    # HF/STO-3G optimization along the same geometries as in h2o_sto3g.fchk,
+    # followed by the final energy evaluation at the stationary point.
+    with path('iodata.test.data', 'water_opt_orca.out') as fn:
+        mols = list(load_many(fn))
+        mol = load_one(fn)
+    with path('iodata.test.data', 'h2o_sto3g.fchk') as fn_fchk:
+        steps = list(load_many(fn_fchk))
+    assert len(mols) == 6
+    for step in mols:
+        assert_equal(step.atnums, [8, 1, 1])
+    for step, ref in zip(mols, steps + steps[-1:]):
+        assert_allclose(step.atcoords, ref.atcoords, atol=1.e-6)
+        assert_allclose(step.energy, ref.energy, atol=1.e-7)
+        assert_allclose(step.extra['scf_energies'][-1], step.energy, atol=1.e-9)
+    assert_allclose(mols[0].extra['scf_energies'], [
+        -73.2412368051, -74.9473476877, -74.9598915311, -74.9606528290,
+        -74.9606984066, -74.9607024789, -74.9607024930, -74.9607024930])
+    assert_allclose(mols[5].extra['scf_energies'], [-74.9659011992, -74.9659011992])
+    assert_allclose(mols[0].energy, -74.960702493007)
+    assert_allclose(mols[5].energy, -74.965901199188)
+    assert_allclose(mols[0].moments[(1, 'c')], [0.38347, 0.54260, 0.00000])
+    assert_allclose(mols[5].moments[(1, 'c')], [0.38810, 0.54915, 0.00000])
+    # load_one returns the results of the last step.
+    assert_allclose(mol.atcoords, mols[5].atcoords)
+    assert_allclose(mol.energy, mols[5].energy)
+    assert_allclose(mol.extra['scf_energies'], mols[5].extra['scf_energies'])
+
+
+def test_load_many_selection():
+    # ORCA outputs are not skipped cheaply, but the frame selection still works.
+    with path('iodata.test.data', 'water_opt_orca.out') as fn:
+        mols = list(load_many(fn, start=4))
+    assert len(mols) == 2
+    assert_allclose(mols[0].energy, -74.965901199187)
+    assert_allclose(mols[1].energy, -74.965901199188)
+
+
+def test_load_many_without_tell():
+    # The sections are located in a memory map, without counting lines with tell,
+    # which keeps large outputs as fast as a plain loop over the lines.
+    with path('iodata.test.data', 'water_opt_orca.out') as fn:
+        lit = LineIterator(str(fn))
+        assert len(list(orcalog.load_many(lit))) == 6
+    assert lit._raw is None  # pylint: disable=protected-access
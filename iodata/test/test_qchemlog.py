@@ -20,8 +20,10 @@
 
 import numpy as np
 from numpy.testing import assert_equal, assert_allclose
+import pytest
 
 from ..api import load_one
+from ..formats import qchemlog
 from ..formats.qchemlog import load_qchemlog_low
 from ..utils import LineIterator, angstrom, kjmol
 
@@ -369,3 +371,42 @@ def test_load_one_h2o_dimer_eda2():
     assert_allclose(mol.extra['frags'][1]['atcoords'], np.array(coords2) * angstrom)
     assert_allclose(mol.extra['frags'][1]['nuclear_repulsion_energy'], 9.17803894)
     assert_allclose(mol.extra['frags'][1]['energy'], -76.4346136883)
+
+
+def test_load_one_qchemlog_freq_sections():
+    with path('iodata.test.data', 'water_hf_ccpvtz_freq_qchem.out') as fq:
+        mol1 = load_one(str(fq), fmt='qchemlog')
+        mol2 = load_one(str(fq), fmt='qchemlog', sections=['energy', 'multipoles'])
+        with pytest.raises(ValueError):
+            load_one(str(fq), fmt='qchemlog', sections=['eda3'])
+    assert_equal(mol2.atnums, mol1.atnums)
+    assert_allclose(mol2.atcoords, mol1.atcoords)
+    assert_allclose(mol2.energy, mol1.energy)
+    assert_allclose(mol2.moments[(1, 'c')], mol1.moments[(1, 'c')])
+    assert mol2.athessian is None
+    assert mol2.mo is None
+    assert 'vib_energy' not in mol2.extra
+
+
+def test_load_one_qchemlog_freq_sections_mo():
+    with path('iodata.test.data', 'water_hf_ccpvtz_freq_qchem.out') as fq:
+        mol1 = load_one(str(fq), fmt='qchemlog')
+        mol2 = load_one(str(fq), fmt='qchemlog', sections=['orbital_energies'])
+        mol3 = load_one(str(fq), fmt='qchemlog', sections=['mulliken'])
+    assert mol2.mo.kind == mol1.mo.kind
+    assert_allclose(mol2.mo.energies, mol1.mo.energies)
+    assert_allclose(mol2.mo.occs, mol1.mo.occs)
+    assert mol2.energy is None
+    # Without the orbital energies, no orbitals are built.
+    assert mol3.mo is None
+    assert_allclose(mol3.atcharges['mulliken'], mol1.atcharges['mulliken'])
+
+
+def test_load_one_qchemlog_without_tell():
+    # The sections are located in a memory map, without counting lines with tell,
+    # which keeps large outputs as fast as a plain loop over the lines.
+    with path('iodata.test.data', 'water_hf_ccpvtz_freq_qchem.out') as fq:
+        lit = LineIterator(str(fq))
+        mol = qchemlog.load_one(lit)
+    assert_allclose(mol['energy'], -76.0571936393)
+    assert lit._raw is None  # pylint: disable=protected-access
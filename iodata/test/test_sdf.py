@@ -130,3 +130,11 @@ def test_v2000_check():
     with path('iodata.test.data', 'molv3000.sdf') as fn_sdf:
         with pytest.raises(FileFormatError):
             load_one(fn_sdf)
+
+
+def test_load_many_selection():
+    with path('iodata.test.data', 'example.sdf') as fn_sdf:
+        mols = list(load_many(str(fn_sdf), start=1))
+    assert len(mols) == 1
+    assert mols[0].title == '24978481'
+    assert_allclose(mols[0].atcoords[1] / angstrom, [1.4030, 1.4030, 0.0000])
@@ -19,8 +19,360 @@
 """Unit tests for iodata.utils."""
 
 
-from ..utils import amu
+import os
+
+import numpy as np
+from numpy.testing import assert_equal, assert_allclose
+import pytest
+
+from ..utils import (amu, LineIterator, LazyCubeData, FileFormatError, PackedFourIndex,
+                     SparseFourIndex, set_four_index_element, set_four_index_elements,
+                     fingerprint, load_sidecar, dump_sidecar)
+from .common import CountingReader
 
 
 def test_amu():
     assert abs(amu * 1.008 - 1837.47) < 1e-1
+
+
+def test_line_iterator_read_array(tmpdir):
+    fn = os.path.join(tmpdir, 'numbers.txt')
+    with open(fn, 'w') as f:
+        f.write('header\r\n 1 2 3\n 4 5\n6\nfooter\n')
+    lit = LineIterator(fn)
+    assert next(lit) == 'header\n'
+    assert lit.lineno == 1
+    assert_equal(lit.read_array(6, int), [1, 2, 3, 4, 5, 6])
+    assert lit.lineno == 4
+    assert next(lit) == 'footer\n'
+    with pytest.raises(StopIteration):
+        next(lit)
+
+
+def test_line_iterator_read_array_irregular(tmpdir):
+    fn = os.path.join(tmpdir, 'numbers.txt')
+    with open(fn, 'w') as f:
+        f.write('header\n 1\n 2 3 4\n 5 6\nfooter\n')
+    lit = LineIterator(fn)
+    next(lit)
+    assert_equal(lit.read_array(6, int), [1, 2, 3, 4, 5, 6])
+    assert lit.lineno == 4
+    assert next(lit) == 'footer\n'
+    lit.seek(0, 0)
+    next(lit)
+    lit.skip_words(6)
+    assert lit.lineno == 4
+    assert next(lit) == 'footer\n'
+
+
+def test_line_iterator_read_array_error(tmpdir):
+    fn = os.path.join(tmpdir, 'numbers.txt')
+    with open(fn, 'w') as f:
+        f.write('header\n 1.0 2.0\n 3.0 x.0\n 5.0\n')
+    lit = LineIterator(fn)
+    next(lit)
+    with pytest.raises(FileFormatError, match=r'numbers.txt:3 Could not interpret: x.0'):
+        lit.read_array(5)
+    lit.seek(0, 0)
+    next(lit)
+    with pytest.raises(FileFormatError, match=r'numbers.txt:3 Expected 3 values, found 4.'):
+        lit.read_array(3)
+
+
+def test_line_iterator_skip_words(tmpdir):
+    fn = os.path.join(tmpdir, 'numbers.txt')
+    with open(fn, 'w') as f:
+        f.write('header\n 1.0 2.0\n 3.0 x.0\n 5.0\nfooter\n')
+    lit = LineIterator(fn)
+    next(lit)
+    lit.skip_words(5)
+    assert lit.lineno == 4
+    assert next(lit) == 'footer\n'
+    lit.seek(0, 0)
+    next(lit)
+    with pytest.raises(FileFormatError, match=r'numbers.txt:3 Expected 3 values, found 4.'):
+        lit.skip_words(3)
+
+
+def test_line_iterator_read_lines(tmpdir):
+    fn = os.path.join(tmpdir, 'lines.txt')
+    with open(fn, 'w') as f:
+        f.write('first\r\nsecond\nthird\nlast')
+    lit = LineIterator(fn)
+    lit.back(next(lit))
+    assert lit.read_lines() == ['first\n', 'second\n', 'third\n', 'last']
+    assert lit.lineno == 4
+    assert lit.read_lines() == []
+
+
+def test_line_iterator_read_lines_count(tmpdir):
+    fn = os.path.join(tmpdir, 'lines.txt')
+    with open(fn, 'w') as f:
+        f.write('first\r\nsecond\nthird\nlast')
+    lit = LineIterator(fn)
+    lit.back(next(lit))
+    assert lit.read_lines(2) == ['first\n', 'second\n']
+    assert lit.lineno == 2
+    assert next(lit) == 'third\n'
+    assert lit.read_lines(1) == ['last']
+    assert lit.lineno == 4
+    assert lit.read_lines(0) == []
+    with pytest.raises(StopIteration):
+        lit.read_lines(1)
+
+
+def test_line_iterator_skip_lines(tmpdir):
+    fn = os.path.join(tmpdir, 'lines.txt')
+    with open(fn, 'w') as f:
+        f.write('first\nsecond\nthird\nlast\n')
+    lit = LineIterator(fn)
+    lit.back(next(lit))
+    lit.skip_lines(2)
+    assert lit.lineno == 2
+    assert lit.tell() == 13
+    assert next(lit) == 'third\n'
+    with pytest.raises(StopIteration):
+        lit.skip_lines(2)
+
+
+def test_line_iterator_scan(tmpdir):
+    fn = os.path.join(tmpdir, 'lines.txt')
+    with open(fn, 'w') as f:
+        f.write('header\n section a\n 1\n 2\nsection b\n section c\n 3\n')
+    lit = LineIterator(fn)
+    lit.back(next(lit))
+    scanner = lit.scan(r' ?section [ac]')
+    assert next(scanner) == ' section a\n'
+    assert lit.lineno == 2
+    assert next(lit) == ' 1\n'
+    line = next(lit)
+    lit.back(line)
+    assert next(scanner) == ' section c\n'
+    assert lit.lineno == 6
+    assert next(lit) == ' 3\n'
+    with pytest.raises(StopIteration):
+        next(scanner)
+    assert lit.lineno == 7
+    assert list(lit.scan('header')) == []
+    fn = os.path.join(tmpdir, 'empty.txt')
+    with open(fn, 'w') as f:
+        pass
+    assert list(LineIterator(fn).scan('header')) == []
+
+
+def test_line_iterator_scan_many(tmpdir):
+    fn = os.path.join(tmpdir, 'lines.txt')
+    with open(fn, 'w') as f:
+        for i in range(10000):
+            f.write('section {}\n{}\nother\n'.format(i, i))
+    lit = LineIterator(fn)
+    for i, line in enumerate(lit.scan('section')):
+        assert line == 'section {}\n'.format(i)
+        assert next(lit) == '{}\n'.format(i)
+        assert lit.lineno == 3 * i + 2
+    assert i == 9999
+    # The lines read in between are followed in the memory map, not with tell.
+    assert lit._raw is None  # pylint: disable=protected-access
+
+
+def test_line_iterator_tell_seek(tmpdir):
+    fn = os.path.join(tmpdir, 'lines.txt')
+    with open(fn, 'w') as f:
+        f.write('first\nsecond\nthird\n')
+    lit = LineIterator(fn)
+    assert lit.tell() == 0
+    next(lit)
+    line = next(lit)
+    assert lit.tell() == 13
+    lit.back(line)
+    assert lit.tell() == 6
+    assert lit.lineno == 1
+    offset = lit.tell()
+    assert next(lit) == 'second\n'
+    assert next(lit) == 'third\n'
+    lit.seek(offset, 1)
+    assert next(lit) == 'second\n'
+    assert lit.lineno == 2
+    lit.back('second\n')
+    with pytest.raises(ValueError):
+        lit.back('first\n')
+
+
+def test_line_iterator_tell_back_many(tmpdir):
+    fn = os.path.join(tmpdir, 'lines.txt')
+    with open(fn, 'w') as f:
+        for i in range(100):
+            f.write('line {:02d}\r\n'.format(i))
+    lit = LineIterator(fn)
+    lines = lit.read_lines(50)
+    assert lit.tell() == 450
+    for line in lines[::-1]:
+        lit.back(line)
+    assert lit.tell() == 0
+    with pytest.raises(ValueError):
+        lit.back(lines[0])
+    lit.skip_lines(30)
+    assert lit.tell() == 270
+    assert next(lit) == 'line 30\n'
+
+
+def test_line_iterator_tell_incremental(tmpdir):
+    # pylint: disable=protected-access
+    fn = os.path.join(tmpdir, 'lines.txt')
+    with open(fn, 'w') as f:
+        for i in range(100000):
+            f.write('line {:06d}\n'.format(i))
+    lit = LineIterator(fn)
+    lit._raw = CountingReader(open(fn, 'rb'))
+    # Consecutive calls only read the bytes consumed in between.
+    for i in range(1, 20001):
+        lit.skip_lines(5)
+        assert lit.tell() == 60 * i
+    assert lit._raw.nread == 1200000
+    # After a seek, only a small block is read.
+    lit.seek(600, 50)
+    lit.skip_lines(3)
+    assert lit.tell() == 636
+    assert lit._raw.nread == 1204096
+
+
+def test_sidecar(tmpdir):
+    fn = os.path.join(tmpdir, 'data.txt')
+    with open(fn, 'w') as f:
+        f.write('data\n')
+    assert load_sidecar(fn, 'key') is None
+    dump_sidecar(fn, 'key', fingerprint(fn), {'a': [1, 2]})
+    assert load_sidecar(fn, 'key') == {'a': [1, 2]}
+    assert load_sidecar(fn, 'other') is None
+    # A corrupt sidecar is ignored.
+    with open(fn + '.index.json', 'w') as f:
+        f.write('{"key": ')
+    assert load_sidecar(fn, 'key') is None
+    # An outdated sidecar is ignored.
+    dump_sidecar(fn, 'key', fingerprint(fn), {'a': [1, 2]})
+    with open(fn, 'a') as f:
+        f.write('more data\n')
+    assert load_sidecar(fn, 'key') is None
+
+
+@pytest.mark.parametrize("fortran", [False, True])
+@pytest.mark.parametrize("chunk_size", [7, 16777216])
+def test_lazy_cube_data(tmpdir, monkeypatch, fortran, chunk_size):
+    monkeypatch.setattr(LazyCubeData, 'chunk_size', chunk_size)
+    data = np.random.uniform(-1, 1, (3, 4, 5))
+    file_data = data.transpose() if fortran else data
+    fn = os.path.join(tmpdir, 'grid.txt')
+    with open(fn, 'w') as f:
+        f.write('header\n')
+        # The line breaks do not coincide with the rows in the file.
+        for i, value in enumerate(file_data.ravel()):
+            f.write(' {:.15e}{}'.format(value, '\n' if i % 7 == 6 else ''))
+        f.write('\ntrailing text\n')
+    lazy = LazyCubeData(fn, 7, 1, data.shape, fortran)
+    assert lazy.shape == data.shape
+    assert lazy.size == data.size
+    assert_allclose(np.asarray(lazy), data)
+    assert_allclose(lazy[1], data[1])
+    assert_allclose(lazy[:, 2], data[:, 2])
+    assert_allclose(lazy[..., 3], data[..., 3])
+    assert_allclose(lazy[-1, ::-2, 1:4], data[-1, ::-2, 1:4])
+    assert_allclose(lazy[2, 3, 4], data[2, 3, 4])
+    assert_allclose(lazy[[0, 2]], data[[0, 2]])
+    lazy *= 2
+    assert_allclose(lazy[:, 1, :], 2 * data[:, 1, :])
+    lit = LineIterator(fn)
+    lit.seek(*lazy.end)
+    assert next(lit) == '\n'
+    assert next(lit) == 'trailing text\n'
+    assert lit.lineno == 3 + data.size // 7
+
+
+def test_lazy_cube_data_errors(tmpdir):
+    fn = os.path.join(tmpdir, 'grid.txt')
+    with open(fn, 'w') as f:
+        f.write('header\n1.0 2.0 3.0\n4.0 5.x 6.0\n7.0 8.0\n')
+    lazy = LazyCubeData(fn, 7, 1, (2, 2, 2))
+    assert_allclose(lazy[0, 0], [1.0, 2.0])
+    with pytest.raises(FileFormatError, match='grid.txt:3 Could not interpret: 5.x'):
+        lazy[1]
+    with pytest.raises(FileFormatError, match='File ended before all data was read.'):
+        LazyCubeData(fn, 7, 1, (3, 2, 2))
+    with pytest.raises(FileFormatError, match='grid.txt:1 The grid has no data points'):
+        LazyCubeData(fn, 7, 1, (2, 0, 2))
+    with open(fn, 'a') as f:
+        f.write('9.0\n')
+    with pytest.raises(FileFormatError, match='File changed after it was indexed.'):
+        lazy[0]
+
+
+def test_packed_four_index():
+    nbasis = 5
+    dense = np.zeros((nbasis,) * 4)
+    packed = PackedFourIndex(nbasis)
+    for i, j, k, l in np.random.randint(0, nbasis, (50, 4)):
+        value = np.random.uniform(-1, 1)
+        set_four_index_element(dense, i, j, k, l, value)
+        set_four_index_element(packed, i, j, k, l, value)
+    assert packed.packed.shape == (120,)
+    assert_allclose(np.asarray(packed), dense)
+    assert_allclose(PackedFourIndex.from_array(dense).packed, packed.packed)
+    assert_allclose(packed[1, 2, 3, 4], dense[1, 2, 3, 4])
+    assert_allclose(packed[2], dense[2])
+    assert_allclose(packed[..., 1:4], dense[..., 1:4])
+    assert_allclose(packed[::-1, 3, :2], dense[::-1, 3, :2])
+    assert_allclose(packed[[0, 3]], dense[[0, 3]])
+    values, p, q, r, s = packed.nonzero()
+    assert (p >= q).all()
+    assert (r >= s).all()
+    assert_allclose(values, dense[p, r, q, s])
+    with pytest.raises(IndexError):
+        packed[0] = 1.0
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_set_four_index_elements(packed):
+    nbasis = 4
+    indexes = np.array([[0, 1, 2, 3], [3, 3, 1, 0], [2, 2, 2, 2], [1, 0, 3, 1]])
+    values = np.array([0.5, -1.5, 2.0, 3.0])
+    expected = np.zeros((nbasis,) * 4)
+    for (i, j, k, l), value in zip(indexes, values):
+        set_four_index_element(expected, i, k, j, l, value)
+    for notation, columns in ('physicists', [0, 2, 1, 3]), ('chemists', [0, 1, 2, 3]):
+        four_index = PackedFourIndex(nbasis) if packed else np.zeros((nbasis,) * 4)
+        set_four_index_elements(four_index, *indexes[:, columns].T, values, notation)
+        assert_allclose(np.asarray(four_index), expected)
+    with pytest.raises(ValueError):
+        set_four_index_elements(four_index, *indexes.T, values, 'mulliken')
+
+
+@pytest.mark.parametrize("packed", [False, True])
+def test_set_four_index_elements_duplicates(packed):
+    nbasis = 4
+    # The first and the last element are related by symmetry, the last one is kept.
+    indexes = np.array([[0, 1, 2, 3], [3, 3, 1, 0], [2, 1, 0, 3], [0, 1, 2, 3]])
+    values = np.array([0.5, -1.5, 2.0, 3.0])
+    four_index = PackedFourIndex(nbasis) if packed else np.zeros((nbasis,) * 4)
+    set_four_index_elements(four_index, *indexes.T, values)
+    expected = np.zeros((nbasis,) * 4)
+    for (i, j, k, l), value in zip(indexes, values):
+        set_four_index_element(expected, i, j, k, l, value)
+    assert_allclose(np.asarray(four_index), expected)
+
+
+def test_sparse_four_index():
+    nbasis = 4
+    dense = np.zeros((nbasis,) * 4)
+    indexes = np.array([[0, 1, 2, 3], [3, 3, 1, 0], [2, 2, 2, 2], [1, 0, 3, 1], [3, 2, 1, 0]])
+    values = np.array([0.5, -1.5, 2.0, 3.0, 4.0])
+    set_four_index_elements(dense, *indexes.T, values)
+    sparse = SparseFourIndex.from_elements(nbasis, *indexes.T, values)
+    # The first and the last element are related by symmetry, the last one is kept.
+    assert_equal(sparse.values.shape, (4,))
+    assert_allclose(np.asarray(sparse), dense)
+    assert_allclose(sparse[0, 1, 2, 3], 4.0)
+    assert_allclose(sparse[1, :, 3], dense[1, :, 3])
+    assert_allclose(SparseFourIndex.from_array(dense).keys, sparse.keys)
+    assert_allclose(sparse.nonzero(2.5)[0], [3.0, 4.0])
+    with pytest.raises(TypeError):
+        set_four_index_elements(sparse, *indexes.T, values)
+    assert_allclose(np.asarray(SparseFourIndex(nbasis, np.zeros(0, int), np.zeros(0))), 0.0)
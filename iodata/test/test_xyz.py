@@ -19,13 +19,17 @@
 """Test iodata.formats.xyz module."""
 
 import os
+import shutil
 
 import numpy as np
 from numpy.testing import assert_equal, assert_allclose
+import pytest
 
-from ..api import load_one, load_many, dump_one, dump_many
-from ..utils import angstrom
+from ..api import load_one, load_many, dump_one, dump_many, index_many, load_frames
+from ..utils import angstrom, FileFormatError, LineIterator, fingerprint, dump_sidecar
+from ..formats import xyz
 from ..formats.xyz import DEFAULT_ATOM_COLUMNS
+from .common import CountingReader
 try:
     from importlib_resources import path
 except ImportError:
@@ -84,6 +88,33 @@ def test_load_fcc_columns():
     assert_allclose(mol.atgradient[-1, -1], -0.928032)
 
 
+def test_load_fcc_default_columns():
+    # Columns not mentioned in atom_columns are ignored.
+    with path('iodata.test.data', 'al_fcc.xyz') as fn_xyz:
+        mol0 = load_one(str(fn_xyz))
+        mol1 = load_one(str(fn_xyz), atom_columns=FCC_ATOM_COLUMNS)
+    assert_equal(mol0.atnums, mol1.atnums)
+    assert_allclose(mol0.atcoords, mol1.atcoords)
+    assert mol0.atgradient is None
+
+
+def test_load_missing_columns(tmpdir):
+    fn_xyz = os.path.join(tmpdir, 'missing.xyz')
+    with open(fn_xyz, 'w') as f:
+        f.write("2\nMissing coordinate\nH 0.0 0.0 0.0\nH 0.0 0.0\n")
+    with pytest.raises(FileFormatError):
+        load_one(fn_xyz)
+
+
+def test_load_misaligned_columns(tmpdir):
+    # The extra word on the first line does not make up for the missing one.
+    fn_xyz = os.path.join(tmpdir, 'misaligned.xyz')
+    with open(fn_xyz, 'w') as f:
+        f.write("2\nMisaligned columns\nH 0.0 0.0 0.0 0.0\nH 0.0 0.0\n")
+    with pytest.raises(FileFormatError):
+        load_one(fn_xyz)
+
+
 def check_load_dump_consistency(tmpdir, fn, atom_columns=None):
     """Check if dumping and loading an XYZ file results in the same data."""
     if atom_columns is None:
@@ -127,6 +158,26 @@ def test_dump_xyz_fcc(tmpdir):
         check_load_dump_consistency(tmpdir, str(fn_xyz), FCC_ATOM_COLUMNS)
 
 
+def test_dump_xyz_water_columns(tmpdir):
+    with path('iodata.test.data', 'water_element.xyz') as fn_xyz:
+        mol = load_one(str(fn_xyz))
+    mol.atcharges = {"mulliken": np.array([0.4, -0.8, 0.4])}
+    atom_columns = DEFAULT_ATOM_COLUMNS + [
+        # Formatted in bulk.
+        ("atcharges", "mulliken", (), float, float, "{{{:6.2f}}}".format),
+        # Formatted value by value.
+        ("atnums", None, (), int, int, (lambda atnum: "[{}]".format(atnum))),
+    ]
+    fn_tmp = os.path.join(tmpdir, 'test.xyz')
+    dump_one(mol, fn_tmp, atom_columns=atom_columns)
+    with open(fn_tmp) as f:
+        assert f.read() == (
+            "3\nWater\n"
+            "H     0.7838370000   -0.4922360000   -0.0000000000 {  0.40} [1]\n"
+            "O    -0.0000000000    0.0620200000   -0.0000000000 { -0.80} [8]\n"
+            "H    -0.7838370000   -0.4922360000   -0.0000000000 {  0.40} [1]\n")
+
+
 def test_load_many():
     with path('iodata.test.data', 'water_trajectory.xyz') as fn_xyz:
         mols = list(load_many(str(fn_xyz)))
@@ -176,3 +227,97 @@ def test_load_dump_many_consistency(tmpdir):
         assert mol0.title == mol1.title
         assert_equal(mol0.atnums, mol1.atnums)
         assert_allclose(mol0.atcoords, mol1.atcoords, atol=1.e-5)
+
+
+def test_load_frames(tmpdir):
+    fn_xyz = os.path.join(tmpdir, 'water_trajectory.xyz')
+    with path('iodata.test.data', 'water_trajectory.xyz') as fn:
+        shutil.copy(str(fn), fn_xyz)
+    mols0 = list(load_many(fn_xyz))
+    index = index_many(fn_xyz)
+    assert index.shape == (5, 2)
+    assert_equal(index[:, 1], np.arange(5) * 5)
+    assert not os.path.isfile(fn_xyz + '.index.json')
+    assert_equal(index_many(fn_xyz, persist=True), index)
+    assert os.path.isfile(fn_xyz + '.index.json')
+    assert_equal(index_many(fn_xyz, persist=True), index)
+    for frames, imols in [(3, [3]), (-1, [4]), (slice(None, None, 2), [0, 2, 4]),
+                          ([4, 1, 1], [4, 1, 1])]:
+        mols1 = list(load_frames(fn_xyz, frames))
+        assert len(mols1) == len(imols)
+        for imol, mol1 in zip(imols, mols1):
+            assert mol1.title == mols0[imol].title
+            assert_equal(mol1.atnums, mols0[imol].atnums)
+            assert_allclose(mol1.atcoords, mols0[imol].atcoords)
+
+
+def test_index_many_linear(tmpdir):
+    # The frames are located in one pass, reading each byte of the file once.
+    fn_xyz = os.path.join(tmpdir, 'many.xyz')
+    with open(fn_xyz, 'w') as f:
+        for iframe in range(20000):
+            f.write('1\nframe {:05d}\nH 0.0 0.0 {:.1f}\n'.format(iframe, iframe % 10))
+    lit = LineIterator(fn_xyz)
+    lit._raw = CountingReader(open(fn_xyz, 'rb'))  # pylint: disable=protected-access
+    index = np.array(list(xyz.index_many(lit)))
+    assert_equal(index[:, 0], np.arange(20000) * 28)
+    assert_equal(index[:, 1], np.arange(20000) * 3)
+    assert lit._raw.nread <= os.path.getsize(fn_xyz)  # pylint: disable=protected-access
+
+
+def test_index_many_outdated(tmpdir):
+    fn_xyz = os.path.join(tmpdir, 'water_trajectory.xyz')
+    with path('iodata.test.data', 'water_trajectory.xyz') as fn:
+        shutil.copy(str(fn), fn_xyz)
+    assert len(index_many(fn_xyz, persist=True)) == 5
+    # Append one frame. The saved index is no longer used.
+    with path('iodata.test.data', 'water_number.xyz') as fn, open(str(fn)) as f:
+        frame = f.read()
+    with open(fn_xyz, 'a') as f:
+        f.write(frame)
+    index = index_many(fn_xyz, persist=True)
+    assert len(index) == 6
+    mol = next(load_frames(fn_xyz, -1, index=index))
+    check_water(mol)
+    # A corrupt index file is replaced.
+    with open(fn_xyz + '.index.json', 'w') as f:
+        f.write('{"key": ')
+    assert_equal(index_many(fn_xyz, persist=True), index)
+    dump_sidecar(fn_xyz, {'format': 'xyz'}, fingerprint(fn_xyz), 'corrupt')
+    assert_equal(index_many(fn_xyz, persist=True), index)
+    assert_equal(index_many(fn_xyz, persist=True), index)
+
+
+def test_load_frames_unsupported_format():
+    with path('iodata.test.data', 'water.xyz') as fn_xyz:
+        with pytest.raises(ValueError):
+            next(load_frames(str(fn_xyz), 0, fmt='molden'))
+
+
+def test_index_many_dataset_emptylines():
+    with path('iodata.test.data', 'dataset_blanklines.xyz') as fn_xyz:
+        index = index_many(str(fn_xyz))
+        mols = list(load_frames(str(fn_xyz), [2, 0], index=index))
+    assert_equal(index[:, 1], [0, 5, 8])
+    assert mols[0].title == "CH4 molecule"
+    assert mols[1].title == "H2O molecule"
+
+
+def test_load_many_selection():
+    with path('iodata.test.data', 'water_trajectory.xyz') as fn_xyz:
+        titles = [mol.title for mol in load_many(str(fn_xyz))]
+        for start, stop, step in [(1, None, 2), (0, 3, 1), (4, None, 1), (2, 2, 1),
+                                  (10, None, 3), (0, None, 10)]:
+            mols = list(load_many(str(fn_xyz), start=start, stop=stop, step=step))
+            assert [mol.title for mol in mols] == titles[start:stop:step]
+        mol = next(load_many(str(fn_xyz), start=3))
+        assert_allclose(mol.atcoords, list(load_many(str(fn_xyz)))[3].atcoords)
+        with pytest.raises(ValueError):
+            next(load_many(str(fn_xyz), step=0))
+
+
+def test_load_many_selection_emptylines():
+    with path('iodata.test.data', 'dataset_blanklines.xyz') as fn_xyz:
+        mols = list(load_many(str(fn_xyz), start=1, step=3))
+        assert [mol.title for mol in mols] == ["N atom"]
+        assert list(load_many(str(fn_xyz), start=3)) == []
@@ -19,7 +19,12 @@
 """Utility functions module."""
 
 
-from typing import Tuple
+import itertools
+import json
+import mmap
+import os
+import re
+from typing import Callable, Iterator, List, Tuple
 import warnings
 
 import attr
@@ -30,8 +35,9 @@ from scipy.linalg import eigh
 from .attrutils import validate_shape
 
 
-__all__ = ['LineIterator', 'Cube', 'set_four_index_element', 'volume',
-           'derive_naturals', 'check_dm']
+__all__ = ['LineIterator', 'fingerprint', 'load_sidecar', 'dump_sidecar', 'Cube',
+           'LazyCubeData', 'cube_region', 'set_four_index_element', 'set_four_index_elements',
+           'PackedFourIndex', 'SparseFourIndex', 'volume', 'derive_naturals', 'check_dm']
 
 
 # The unit conversion factors below can be used as follows:
@@ -59,8 +65,14 @@ class FileFormatWarning(Warning):
     """Raised when incorrect content is encountered and fixed when loading files."""
 
 
-class LineIterator:
-    """Iterator class for looping over lines and keeping track of the line number."""
+class LineIterator:  # pylint: disable=too-many-instance-attributes
+    """Iterator class for looping over lines and keeping track of the line number.
+
+    The byte offsets of the lines, used by :meth:`tell`, are only worked out when they
+    are needed, such that plain iteration is as fast as for a regular file. The method
+    :meth:`read_array` converts a sequence of numbers spread over multiple lines in one
+    NumPy call, which is considerably faster than converting each word separately.
+    """
 
     def __init__(self, filename: str):
         """Initialize a LineIterator.
@@ -75,9 +87,18 @@ class LineIterator:
         self.f = open(filename)  # pylint: disable=consider-using-with
         self.lineno = 0
         self.stack = []
+        # The offset and lineno of the last seek, and the offset and number of lines
+        # since the last seek of the most recent call to tell.
+        self._origin = (0, 0)
+        self._anchor = (0, 0)
+        self._raw = None
+        # The offset, the size and the newline offsets of the last block read by tell.
+        self._block = (0, 0, np.zeros(0, dtype=np.int64))
 
     def __del__(self):
         self.f.close()
+        if self._raw is not None:
+            self._raw.close()
 
     def __iter__(self):
         return self
@@ -91,6 +112,313 @@ class LineIterator:
         self.lineno += 1
         return line
 
+    def read_lines(self, count: int = None) -> List[str]:
+        """Read a number of lines, by default all remaining lines, at once.
+
+        This is considerably faster than iterating over the lines. The lineno attribute
+        is increased by the number of lines read.
+
+        Parameters
+        ----------
+        count
+            The number of lines to read. When not given, all remaining lines are read.
+
+        Returns
+        -------
+        lines
+            The lines, including line endings, as returned by ``next``.
+
+        Raises
+        ------
+        StopIteration
+            When fewer than ``count`` lines are left in the file.
+
+        """
+        lines = self._read_available(count)
+        if count is not None and len(lines) < count:
+            raise StopIteration
+        return lines
+
+    def _read_available(self, count: int = None) -> List[str]:
+        """Read at most a given number of lines, fewer at the end of the file."""
+        lines = self.stack[::-1]
+        del self.stack[:]
+        if count is None:
+            lines.extend(self.f)
+        elif len(lines) > count:
+            self.stack = lines[count:][::-1]
+            del lines[count:]
+        else:
+            lines.extend(itertools.islice(self.f, count - len(lines)))
+        self.lineno += len(lines)
+        return lines
+
+    def skip_lines(self, count: int):
+        """Skip a number of lines without returning them.
+
+        Parameters
+        ----------
+        count
+            The number of lines to skip. The lineno attribute is increased accordingly.
+
+        Raises
+        ------
+        StopIteration
+            When fewer than ``count`` lines are left in the file.
+
+        """
+        self.read_lines(count)
+
+    def scan(self, pattern: str) -> Iterator[str]:
+        """Iterate over the remaining lines that match a regular expression.
+
+        This is equivalent to iterating over all lines and only keeping those for which
+        ``re.match(pattern, line)`` succeeds, but much faster: the file is memory-mapped
+        and searched in bulk, without decoding the lines in between. After each line is
+        returned, the iterator is positioned after it, such that the subsequent lines can
+        be read as usual before continuing the scan.
+
+        Parameters
+        ----------
+        pattern
+            The regular expression, matched at the beginning of each line. It may only
+            match ASCII text.
+
+        Yields
+        ------
+        line
+            The matching lines, as returned by ``next``.
+
+        """
+        head = re.compile(pattern.encode())
+        # Searching for a newline followed by the pattern is much faster than using
+        # the MULTILINE flag, because the regex engine can skip to newlines.
+        regex = re.compile(b'\n(?:' + pattern.encode() + b')')
+        # An empty file cannot be memory-mapped.
+        if os.fstat(self.f.fileno()).st_size == 0:
+            buf = b''
+        else:
+            buf = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            offset = self.tell()
+            while True:
+                if head.match(buf, offset):
+                    end = offset
+                else:
+                    match = regex.search(buf, offset)
+                    end = len(buf) if match is None else match.start() + 1
+                # Count the skipped lines in chunks, to avoid large copies.
+                lineno = self.lineno
+                for begin in range(offset, end, 16777216):
+                    lineno += buf[begin:min(end, begin + 16777216)].count(b'\n')
+                self.seek(end, lineno)
+                if end == len(buf):
+                    return
+                try:
+                    yield next(self)
+                except StopIteration:
+                    return
+                # Follow the lines read by the caller in the buffer, starting after
+                # the yielded line, instead of counting them again with tell.
+                if self.lineno > lineno:
+                    offset = end
+                    for _ in range(self.lineno - lineno):
+                        offset = buf.find(b'\n', offset) + 1
+                        if offset == 0:
+                            offset = len(buf)
+                            break
+                else:
+                    offset = self.tell()
+        finally:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+    def tell(self) -> int:
+        """Return the byte offset of the next line.
+
+        The offset is found by counting newlines in the file, starting from the previous
+        call to :meth:`tell` or :meth:`seek`. Hence, the lineno attribute must not be
+        modified in between, except through ``next`` or :meth:`back`. The newline offsets
+        of the last block read from the file are kept, such that the cost of consecutive
+        calls scales with the number of bytes read in between.
+        """
+        count = self.lineno - self._origin[1]
+        offset, start = self._anchor
+        if count < start:
+            # Lines were put back after the previous call.
+            offset, start = self._origin[0], 0
+        while start < count:
+            newlines = self._block_newlines(offset)
+            if newlines is None:
+                # The last line has no trailing newline.
+                break
+            if start + len(newlines) >= count:
+                offset = int(newlines[count - start - 1]) + 1
+                break
+            start += len(newlines)
+            offset = self._block[0] + self._block[1]
+        self._anchor = (offset, count)
+        return offset
+
+    def _block_newlines(self, offset: int) -> np.ndarray:
+        """Return the offsets of the newlines after a given offset in the current block.
+
+        When the offset lies outside the current block, a new block is read, which is
+        larger when it directly follows the current one. None is returned at the end of
+        the file.
+        """
+        block_offset, block_size, newlines = self._block
+        if not block_offset <= offset < block_offset + block_size:
+            if offset == block_offset + block_size and block_size > 0:
+                block_size = min(2 * block_size, 1048576)
+            else:
+                block_size = 4096
+            if self._raw is None:
+                self._raw = open(self.filename, 'rb')  # pylint: disable=consider-using-with
+            self._raw.seek(offset)
+            chunk = self._raw.read(block_size)
+            if not chunk:
+                return None
+            newlines = np.flatnonzero(np.frombuffer(chunk, dtype=np.uint8) == ord('\n'))
+            newlines += offset
+            self._block = (offset, len(chunk), newlines)
+            return newlines
+        return newlines[np.searchsorted(newlines, offset):]
+
+    def seek(self, offset: int, lineno: int):
+        """Continue reading from a given byte offset.
+
+        Parameters
+        ----------
+        offset
+            The byte offset of the next line, e.g. obtained with :meth:`tell`.
+        lineno
+            The number of lines preceding the offset, used for error messages.
+
+        """
+        self.f.seek(offset)
+        self.stack = []
+        self._origin = (offset, lineno)
+        self._anchor = (offset, 0)
+        self.lineno = lineno
+
+    def _read_words(self, size: int, convert: Callable[[List[str]], Tuple[object, int]]):
+        """Read lines in bulk until they contain a given number of words.
+
+        The number of lines needed is estimated from the number of words on the first
+        line. When some lines contain more words, or when they cannot be converted, the
+        lines of the last bulk read are put back and read one by one.
+
+        Parameters
+        ----------
+        size
+            The number of words to read. The last line may not contain more words than
+            needed.
+        convert
+            A function converting a list of lines into a result and the number of words
+            on those lines. It raises a ValueError when the lines cannot be converted.
+
+        Returns
+        -------
+        results
+            The results of ``convert`` for consecutive groups of lines.
+
+        """
+        results = []
+        count = 0
+        per_line = None
+        while count < size:
+            if per_line is None:
+                lines = [next(self)]
+            else:
+                lines = self._read_available(max(1, (size - count) // per_line))
+                if not lines:
+                    raise StopIteration
+            if len(lines) == 1:
+                # Too many words are reported before any conversion errors.
+                nword = len(lines[0].split())
+                if count + nword > size:
+                    self.error("Expected {} values, found {}.".format(size, count + nword))
+            try:
+                result, nword = convert(lines)
+            except ValueError:
+                if len(lines) == 1:
+                    raise
+                nword = None
+            if nword is None or count + nword > size:
+                for line in lines[::-1]:
+                    self.back(line)
+                per_line = size
+                continue
+            if per_line is None:
+                per_line = max(1, nword)
+            count += nword
+            results.append(result)
+        return results
+
+    def _convert_lines(self, lines: List[str], dtype: type) -> Tuple[np.ndarray, int]:
+        """Convert all words on the given lines, which were just read, into an array.
+
+        When a single line cannot be converted, the offending word is reported. Otherwise,
+        a ValueError is raised.
+        """
+        try:
+            with warnings.catch_warnings():
+                # NumPy warns when not all words can be converted.
+                warnings.simplefilter('error', DeprecationWarning)
+                array = np.fromstring(' '.join(lines), dtype=dtype, sep=' ')
+            return array, len(array)
+        except (DeprecationWarning, ValueError):
+            pass
+        words = ' '.join(lines).split()
+        try:
+            return np.array(words, dtype=dtype), len(words)
+        except (ValueError, OverflowError) as exc:
+            if len(lines) == 1:
+                for word in words:
+                    try:
+                        np.array(word, dtype=dtype)
+                    except (ValueError, OverflowError):
+                        self.error("Could not interpret: {}".format(word))
+            raise ValueError("Could not interpret the words.") from exc
+
+    def read_array(self, size: int, dtype: type = float) -> np.ndarray:
+        """Read a given number of whitespace-separated words as an array.
+
+        Lines are read in bulk until ``size`` words are found. The words on these lines
+        are converted in a single NumPy call. The last line may not contain more words
+        than needed.
+
+        Parameters
+        ----------
+        size
+            The number of words to read.
+        dtype
+            The data type of the result.
+
+        Returns
+        -------
+        array
+            A one-dimensional array with the converted words.
+
+        """
+        arrays = self._read_words(size, lambda lines: self._convert_lines(lines, dtype))
+        if len(arrays) == 1:
+            return arrays[0]
+        return np.concatenate(arrays + [np.zeros(0, dtype)])
+
+    def skip_words(self, size: int):
+        """Skip a given number of whitespace-separated words without converting them.
+
+        Parameters
+        ----------
+        size
+            The number of words to skip. The last line may not contain more words
+            than needed.
+
+        """
+        self._read_words(size, lambda lines: (None, len(' '.join(lines).split())))
+
     def error(self, msg: str):
         """Raise an error while reading a file.
 
@@ -115,11 +443,89 @@ class LineIterator:
                       FileFormatWarning, 2)
 
     def back(self, line):
-        """Go one line back and decrease the lineno attribute by one."""
+        """Go one line back and decrease the lineno attribute by one.
+
+        The given line is returned by the next call to ``next``. Lines can be put back
+        up to the position of the last call to :meth:`seek`.
+        """
+        if self.lineno <= self._origin[1]:
+            raise ValueError("Cannot go back further than the lines read since the last seek.")
         self.stack.append(line)
         self.lineno -= 1
 
 
+SIDECAR_SUFFIX = '.index.json'
+
+
+def fingerprint(filename: str) -> Tuple[int, int]:
+    """Return the size and modification time of a file, to detect changes.
+
+    Parameters
+    ----------
+    filename
+        The file to be fingerprinted.
+
+    Returns
+    -------
+    fingerprint
+        The size (in bytes) and the modification time (in nanoseconds) of the file.
+
+    """
+    stat = os.stat(filename)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def load_sidecar(filename: str, key) -> object:
+    """Load data about a file from its sidecar file, with suffix ``.index.json``.
+
+    Parameters
+    ----------
+    filename
+        The file described by the sidecar.
+    key
+        A JSON-compatible value, which must be equal to the one used when the sidecar
+        was written, e.g. to distinguish file formats or loading options.
+
+    Returns
+    -------
+    data
+        The data stored in the sidecar, or None when the sidecar is missing, unreadable,
+        written for another key, or older than the current version of the file.
+
+    """
+    try:
+        with open(filename + SIDECAR_SUFFIX) as f:
+            sidecar = json.load(f)
+        if sidecar['key'] != key or tuple(sidecar['fingerprint']) != fingerprint(filename):
+            return None
+        return sidecar['data']
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def dump_sidecar(filename: str, key, file_fingerprint: Tuple[int, int], data):
+    """Write data about a file to its sidecar file, with suffix ``.index.json``, if possible.
+
+    Parameters
+    ----------
+    filename
+        The file described by the sidecar.
+    key
+        A JSON-compatible value, see :func:`load_sidecar`.
+    file_fingerprint
+        The result of :func:`fingerprint`, obtained before the file was read.
+    data
+        JSON-compatible data to be stored.
+
+    """
+    try:
+        with open(filename + SIDECAR_SUFFIX, 'w') as f:
+            json.dump({'key': key, 'fingerprint': file_fingerprint, 'data': data}, f)
+    except OSError:
+        # The sidecar is only an optimization, e.g. the directory may be read-only.
+        pass
+
+
 @attr.s(auto_attribs=True, slots=True,
         on_setattr=[attr.setters.validate, attr.setters.convert])
 class Cube:
@@ -134,7 +540,8 @@ class Cube:
         neighboring grid points along the first, second and third axis,
         respectively.
     data
-        A (K, L, M) array of data on a uniform grid
+        A (K, L, M) array of data on a uniform grid. This may also be a
+        LazyCubeData instance, see the ``lazy`` option of the loaders.
 
     """
 
@@ -148,6 +555,269 @@ class Cube:
         return self.data.shape
 
 
+class LazyCubeData:
+    """Volumetric data in a text file, only decoded when it is indexed.
+
+    When constructed, the file is memory-mapped and scanned once (without converting any
+    numbers) to locate the first value of each row, i.e. each block of values along the
+    axis that runs fastest in the file. Indexing with integers and slices only decodes the
+    rows that are needed. Other types of indexing and conversion to a NumPy array decode
+    all data.
+
+    Attributes
+    ----------
+    filename
+        The file containing the volumetric data.
+    shape
+        The shape of the data.
+    fortran
+        When True, the first index runs fastest in the file (as in VASP files).
+        Otherwise, the last index runs fastest (as in cube files).
+    scale
+        A factor to multiply decoded values with.
+
+    """
+
+    dtype = np.dtype(float)
+    ndim = 3
+    # Number of bytes processed at once when scanning the file.
+    chunk_size = 16777216
+
+    def __init__(self, filename: str, offset: int, lineno: int, shape: Tuple[int, int, int],
+                 fortran: bool = False, scale: float = 1.0):
+        """Initialize a LazyCubeData instance.
+
+        Parameters
+        ----------
+        filename
+            The file containing the volumetric data.
+        offset
+            The byte offset at which the data starts.
+        lineno
+            The number of lines preceding the offset, used for error messages.
+        shape
+            The shape of the data.
+        fortran
+            When True, the first index runs fastest in the file.
+        scale
+            A factor to multiply decoded values with.
+
+        """
+        self.filename = filename
+        self.shape = tuple(int(size) for size in shape)
+        self.fortran = fortran
+        self.scale = scale
+        self._fingerprint = fingerprint(filename)
+        self._starts, self._linenos, self._end_lineno = self._index_rows(offset, lineno)
+
+    @property
+    def size(self) -> int:
+        """Return the number of data points."""
+        return self.shape[0] * self.shape[1] * self.shape[2]
+
+    def __len__(self):
+        return self.shape[0]
+
+    @property
+    def end(self) -> Tuple[int, int]:
+        """Return the byte offset just after the last value and the number of preceding lines.
+
+        This can be passed to :meth:`LineIterator.seek` to continue reading after the data.
+        """
+        return int(self._starts[-1]), self._end_lineno
+
+    @property
+    def _file_shape(self) -> Tuple[int, int, int]:
+        """Shape of the data as it is ordered in the file."""
+        return self.shape[::-1] if self.fortran else self.shape
+
+    def _index_rows(self, offset: int, lineno: int) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Locate the first value of each row in the file.
+
+        Parameters
+        ----------
+        offset
+            The byte offset at which the data starts.
+        lineno
+            The number of lines preceding the offset.
+
+        Returns
+        -------
+        starts
+            Byte offsets of the first value of each row. The last element is the
+            byte offset just after the last value.
+        linenos
+            Line numbers of the first value of each row.
+        end_lineno
+            The number of lines preceding the last value.
+
+        """
+        nvalue = self.size
+        if nvalue == 0:
+            raise FileFormatError("{}:{} The grid has no data points, shape={}.".format(
+                self.filename, lineno, self.shape))
+        buf = np.memmap(self.filename, dtype=np.uint8, mode='r')
+        row_size = self._file_shape[2]
+        nrow = nvalue // row_size
+        starts = np.zeros(nrow + 1, np.int64)
+        linenos = np.zeros(nrow, np.int64)
+        ntoken = 0
+        end_lineno = lineno
+        prev_space = True
+        while ntoken < nvalue:
+            if offset >= buf.size:
+                raise FileFormatError("{}:{} File ended before all data was read.".format(
+                    self.filename, lineno))
+            chunk = np.asarray(buf[offset:offset + self.chunk_size])
+            # Bytes up to and including the space character are treated as whitespace.
+            space = chunk <= 32
+            previous = np.empty_like(space)
+            previous[0] = prev_space
+            previous[1:] = space[:-1]
+            token_starts = np.flatnonzero(~space & previous)[:nvalue - ntoken]
+            newlines = np.flatnonzero(chunk == 10)
+            # Select the tokens at the beginning of a row.
+            first = -ntoken % row_size
+            row_starts = token_starts[first::row_size]
+            irow = (ntoken + first) // row_size
+            starts[irow:irow + len(row_starts)] = offset + row_starts
+            linenos[irow:irow + len(row_starts)] = \
+                lineno + 1 + np.searchsorted(newlines, row_starts)
+            ntoken += len(token_starts)
+            if ntoken == nvalue:
+                # Find the end of the last value.
+                last = offset + token_starts[-1]
+                tail = np.asarray(buf[last:last + 256]) <= 32
+                starts[-1] = last + (np.argmax(tail) if tail.any() else len(tail))
+                end_lineno = lineno + np.searchsorted(newlines, token_starts[-1])
+            lineno += len(newlines)
+            prev_space = space[-1]
+            offset += len(chunk)
+        return starts, linenos, int(end_lineno)
+
+    def _decode_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Decode a selection of rows.
+
+        Parameters
+        ----------
+        rows
+            One-dimensional array with the indexes of the rows to decode.
+
+        Returns
+        -------
+        values
+            An array with shape ``(len(rows), row_size)``.
+
+        """
+        if fingerprint(self.filename) != self._fingerprint:
+            raise FileFormatError("{}: File changed after it was indexed.".format(
+                self.filename))
+        buf = np.memmap(self.filename, dtype=np.uint8, mode='r')
+        row_size = self._file_shape[2]
+        result = np.zeros((len(rows), row_size))
+        order = np.argsort(rows, kind='stable')
+        sorted_rows = rows[order]
+        # Consecutive rows are decoded at once.
+        breaks = np.flatnonzero(np.diff(sorted_rows) != 1) + 1
+        for begin, end in zip(np.concatenate([[0], breaks]),
+                              np.concatenate([breaks, [len(rows)]])):
+            first = sorted_rows[begin]
+            last = sorted_rows[end - 1]
+            segment = bytes(buf[self._starts[first]:self._starts[last + 1]])
+            words = segment.split()
+            if len(words) != (end - begin) * row_size:
+                raise FileFormatError("{}:{} Expected {} values, found {}.".format(
+                    self.filename, self._linenos[first], (end - begin) * row_size,
+                    len(words)))
+            try:
+                values = np.array(words, dtype=float)
+            except ValueError:
+                self._locate_error(segment, self._linenos[first])
+                raise
+            result[order[begin:end]] = values.reshape(-1, row_size)
+        result *= self.scale
+        return result
+
+    def _locate_error(self, segment: bytes, lineno: int):
+        """Raise an error for the first value in segment that cannot be converted."""
+        for iline, line in enumerate(segment.split(b'\n')):
+            for word in line.split():
+                try:
+                    float(word)
+                except ValueError as err:
+                    raise FileFormatError("{}:{} Could not interpret: {}".format(
+                        self.filename, lineno + iline, word.decode())) from err
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        ellipses = [i for i, item in enumerate(key) if item is Ellipsis]
+        if ellipses:
+            i = ellipses[0]
+            key = key[:i] + (slice(None),) * (4 - len(key)) + key[i + 1:]
+        key = key + (slice(None),) * (3 - len(key))
+        if len(key) != 3 or not all(isinstance(item, (int, np.integer, slice))
+                                    for item in key):
+            return np.asarray(self)[key]
+        file_shape = self._file_shape
+        if self.fortran:
+            key = key[::-1]
+        rows = np.arange(file_shape[0] * file_shape[1]).reshape(file_shape[:2])[key[:2]]
+        values = self._decode_rows(rows.ravel()).reshape(rows.shape + (file_shape[2],))
+        values = values[..., key[2]]
+        if self.fortran:
+            values = values.transpose()
+        return values
+
+    def __array__(self, dtype=None):
+        return np.asarray(self[:, :, :], dtype=dtype)
+
+    def __imul__(self, factor: float):
+        self.scale *= factor
+        return self
+
+    def __itruediv__(self, factor: float):
+        self.scale /= factor
+        return self
+
+
+def cube_region(origin: np.ndarray, axes: np.ndarray, shape: Tuple[int, int, int],
+                region: tuple) -> Tuple[np.ndarray, np.ndarray, tuple]:
+    """Compute the origin and axes of a sub-grid of a uniform grid.
+
+    Parameters
+    ----------
+    origin
+        The origin of the full grid.
+    axes
+        A (3, 3) array with the spacings of the full grid.
+    shape
+        The shape of the full grid.
+    region
+        A tuple of (at most three) slices, selecting a sub-box and/or stride.
+
+    Returns
+    -------
+    origin
+        The origin of the sub-grid, i.e. the position of its first point.
+    axes
+        The spacings of the sub-grid.
+    region
+        The region as a tuple of three slices.
+
+    """
+    if not isinstance(region, tuple):
+        region = (region,)
+    if len(region) > 3 or not all(isinstance(item, slice) for item in region):
+        raise TypeError("A region must be a tuple of at most three slices.")
+    region = region + (slice(None),) * (3 - len(region))
+    starts, _stops, steps = np.array([item.indices(size) for item, size
+                                      in zip(region, shape)]).T
+    origin = origin + np.dot(starts, axes)
+    axes = axes * steps.reshape(-1, 1)
+    return origin, axes, region
+
+
 def set_four_index_element(four_index_object: np.ndarray, i: int, j: int, k: int, l: int,
                            value: float):
     """Assign values to a four index object, account for 8-fold index symmetry.
@@ -175,6 +845,337 @@ def set_four_index_element(four_index_object: np.ndarray, i: int, j: int, k: int
     four_index_object[l, i, j, k] = value
 
 
+def _pair_index(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """Return the position of a symmetric pair of indexes in a packed lower triangle."""
+    big = np.maximum(p, q)
+    return big * (big + 1) // 2 + np.minimum(p, q)
+
+
+def _unpair_index(index: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the pair of indexes (big, small) at a position in a packed lower triangle."""
+    index = np.asarray(index, dtype=np.int64)
+    big = ((np.sqrt(8 * index + 1) - 1) // 2).astype(np.int64)
+    # Correct for rounding errors in the square root.
+    big -= big * (big + 1) // 2 > index
+    big += (big + 1) * (big + 2) // 2 <= index
+    return big, index - big * (big + 1) // 2
+
+
+def _unique_last(positions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the sorted unique positions and the index of the last occurrence of each."""
+    positions = np.ravel(positions)
+    # Reverse the order, such that np.unique finds the last occurrence.
+    unique, first = np.unique(positions[::-1], return_index=True)
+    return unique, len(positions) - 1 - first
+
+
+class PackedFourIndex:
+    r"""A four-index object with 8-fold symmetry, of which only unique elements are stored.
+
+    The object behaves like a dense array in physicists' notation, i.e. with the same
+    symmetries as assumed by :func:`set_four_index_element`. Indexing with integers and
+    slices only unpacks the requested elements. Other types of indexing and conversion
+    to a NumPy array unpack all elements.
+
+    The unique elements are stored in chemists' notation, :math:`(pq|rs)` with
+    :math:`p \\geq q`, :math:`r \\geq s` and :math:`pq \\geq rs`, where :math:`pq` is the
+    position of the pair in a packed lower triangle. They are ordered in the same way
+    as in an FCIDUMP file.
+
+    Attributes
+    ----------
+    nbasis
+        The number of basis functions.
+    packed
+        The unique elements. shape=(npair * (npair + 1) // 2,) with
+        ``npair = nbasis * (nbasis + 1) // 2``.
+
+    """
+
+    dtype = np.dtype(float)
+    ndim = 4
+
+    def __init__(self, nbasis: int, packed: np.ndarray = None):
+        """Initialize a PackedFourIndex instance.
+
+        Parameters
+        ----------
+        nbasis
+            The number of basis functions.
+        packed
+            The unique elements. When not given, all elements are set to zero.
+
+        """
+        self.nbasis = nbasis
+        npair = nbasis * (nbasis + 1) // 2
+        size = npair * (npair + 1) // 2
+        if packed is None:
+            packed = np.zeros(size)
+        elif packed.shape != (size,):
+            raise TypeError("Expecting {} packed elements for {} basis functions.".format(
+                size, nbasis))
+        self.packed = packed
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> "PackedFourIndex":
+        """Pack a dense four-index object in physicists' notation.
+
+        Parameters
+        ----------
+        array
+            The dense array. Only one element of each group of symmetry-related
+            elements is used.
+
+        """
+        nbasis = len(array)
+        p, q = _unpair_index(np.arange(nbasis * (nbasis + 1) // 2))
+        result = cls(nbasis)
+        # Loop over the first pair to avoid large temporary arrays.
+        begin = 0
+        for pq, (ip, iq) in enumerate(zip(p, q)):
+            end = begin + pq + 1
+            result.packed[begin:end] = array[ip, p[:pq + 1], iq, q[:pq + 1]]
+            begin = end
+        return result
+
+    @property
+    def shape(self) -> Tuple[int, int, int, int]:
+        """Return the shape of the dense array."""
+        return (self.nbasis,) * 4
+
+    @property
+    def size(self) -> int:
+        """Return the number of elements in the dense array."""
+        return self.nbasis ** 4
+
+    def __len__(self):
+        return self.nbasis
+
+    @staticmethod
+    def index(i, j, k, l) -> np.ndarray:
+        """Return the positions in ``packed`` of elements in physicists' notation.
+
+        Parameters
+        ----------
+        i, j, k, l
+            Integers or (broadcastable) integer arrays with indexes of the elements.
+
+        """
+        return _pair_index(_pair_index(i, k), _pair_index(j, l))
+
+    def nonzero(self, threshold: float = 0.0) \
+            -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return the nonzero unique elements and their indexes in chemists' notation.
+
+        Parameters
+        ----------
+        threshold
+            Elements whose absolute value does not exceed the threshold are omitted.
+            NaN values are always returned.
+
+        Returns
+        -------
+        values, p, q, r, s
+            Arrays with the elements :math:`(pq|rs)`, in the order of ``packed``.
+
+        """
+        indexes = np.flatnonzero(~(abs(self.packed) <= threshold))
+        pq, rs = _unpair_index(indexes)
+        return (self.packed[indexes],) + _unpair_index(pq) + _unpair_index(rs)
+
+    def __array__(self, dtype=None):
+        result = np.zeros(self.shape, dtype=dtype or self.dtype)
+        # Unpack one slice at a time to avoid large temporary arrays.
+        for i in range(self.nbasis):
+            result[i] = self[i]
+        return result
+
+    def _normalize_key(self, key) -> tuple:
+        """Expand a key to four items, or return None for unsupported keys."""
+        if not isinstance(key, tuple):
+            key = (key,)
+        for iitem, item in enumerate(key):
+            if item is Ellipsis:
+                key = key[:iitem] + (slice(None),) * (5 - len(key)) + key[iitem + 1:]
+                break
+        if len(key) > 4:
+            raise IndexError("Too many indices for a four-index object.")
+        key = key + (slice(None),) * (4 - len(key))
+        if all(isinstance(item, (slice, int, np.integer)) for item in key):
+            return key
+        return None
+
+    def __getitem__(self, key):
+        normalized = self._normalize_key(key)
+        if normalized is None:
+            return np.asarray(self)[key]
+        ranges = [np.arange(self.nbasis)[item] for item in normalized]
+        grids = np.ix_(*[np.atleast_1d(r) for r in ranges])
+        result = self._lookup(self.index(*grids))
+        return result[tuple(0 if r.ndim == 0 else slice(None) for r in ranges)]
+
+    def _lookup(self, positions: np.ndarray) -> np.ndarray:
+        """Return the unique elements at the given positions in ``packed``."""
+        return self.packed[positions]
+
+    def __setitem__(self, key, value):
+        key = self._normalize_key(key)
+        if key is None or not all(isinstance(item, (int, np.integer)) for item in key):
+            raise IndexError("Only individual elements of a PackedFourIndex can be set.")
+        self._store(self.index(*key), value)
+
+    def _store(self, positions: np.ndarray, values: np.ndarray):
+        """Set the unique elements at the given positions in ``packed``."""
+        self.packed[positions] = values
+
+
+class SparseFourIndex(PackedFourIndex):
+    """A four-index object with 8-fold symmetry, of which only nonzero unique elements are stored.
+
+    This is a coordinate-list variant of :class:`PackedFourIndex`, for four-index objects
+    with many negligible elements. It behaves in the same way, except that elements
+    cannot be set after construction.
+
+    Attributes
+    ----------
+    nbasis
+        The number of basis functions.
+    keys
+        The sorted positions of the stored elements in the packed form, see
+        :meth:`PackedFourIndex.index`.
+    values
+        The stored elements.
+
+    """
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, nbasis: int, keys: np.ndarray, values: np.ndarray):
+        """Initialize a SparseFourIndex instance.
+
+        Parameters
+        ----------
+        nbasis
+            The number of basis functions.
+        keys
+            The sorted positions of the stored elements in the packed form.
+        values
+            The stored elements.
+
+        """
+        if keys.shape != values.shape:
+            raise TypeError("The keys and values must have the same shape.")
+        self.nbasis = nbasis
+        self.keys = keys
+        self.values = values
+
+    @classmethod
+    def from_elements(cls, nbasis: int, i: np.ndarray, j: np.ndarray, k: np.ndarray,
+                      l: np.ndarray, values: np.ndarray,
+                      notation: str = 'physicists') -> "SparseFourIndex":
+        """Construct a sparse four-index object from a list of unique elements.
+
+        Parameters
+        ----------
+        nbasis
+            The number of basis functions.
+        i, j, k, l
+            Integer arrays with the indices of the elements.
+        values
+            The values of the elements. When an element is given multiple times,
+            the last value is used.
+        notation
+            The notation of the indices: ``'physicists'`` or ``'chemists'``.
+
+        """
+        if notation == 'chemists':
+            j, k = k, j
+        elif notation != 'physicists':
+            raise ValueError("Unknown notation: {}".format(notation))
+        keys, select = _unique_last(cls.index(i, j, k, l))
+        return cls(nbasis, keys, np.asarray(values)[select])
+
+    @classmethod
+    def from_array(cls, array: np.ndarray) -> "SparseFourIndex":
+        """Store the nonzero elements of a dense four-index object in physicists' notation.
+
+        Parameters
+        ----------
+        array
+            The dense array. Only one element of each group of symmetry-related
+            elements is used.
+
+        """
+        packed = PackedFourIndex.from_array(array).packed
+        keys = np.flatnonzero(packed)
+        return cls(len(array), keys, packed[keys])
+
+    def nonzero(self, threshold: float = 0.0) \
+            -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return the nonzero unique elements and their indexes in chemists' notation.
+
+        Parameters
+        ----------
+        threshold
+            Elements whose absolute value does not exceed the threshold are omitted.
+            NaN values are always returned.
+
+        Returns
+        -------
+        values, p, q, r, s
+            Arrays with the elements :math:`(pq|rs)`, in the order of the packed form.
+
+        """
+        mask = ~(abs(self.values) <= threshold)
+        pq, rs = _unpair_index(self.keys[mask])
+        return (self.values[mask],) + _unpair_index(pq) + _unpair_index(rs)
+
+    def _lookup(self, positions: np.ndarray) -> np.ndarray:
+        if len(self.keys) == 0:
+            return np.zeros(positions.shape)
+        found = np.searchsorted(self.keys, positions).clip(max=len(self.keys) - 1)
+        return np.where(self.keys[found] == positions, self.values[found], 0.0)
+
+    def _store(self, positions: np.ndarray, values: np.ndarray):
+        raise TypeError("Elements of a SparseFourIndex cannot be set.")
+
+
+def set_four_index_elements(four_index_object, i: np.ndarray, j: np.ndarray, k: np.ndarray,
+                            l: np.ndarray, values: np.ndarray, notation: str = 'physicists'):
+    """Assign many values to a four index object, account for 8-fold index symmetry.
+
+    This is the batched counterpart of :func:`set_four_index_element`. All eight
+    symmetry-related assignments are carried out with fancy indexing.
+
+    Parameters
+    ----------
+    four_index_object
+        The four-index object, in physicists' notation. It will be written to.
+        This is a dense array with shape=(nbasis, nbasis, nbasis, nbasis) or a
+        ``PackedFourIndex`` instance.
+    i, j, k, l
+        Integer arrays with the indices to assign to.
+    values
+        The values of the matrix elements to store.
+    notation
+        The notation of the indices: ``'physicists'`` or ``'chemists'``.
+
+    """
+    if notation == 'chemists':
+        j, k = k, j
+    elif notation != 'physicists':
+        raise ValueError("Unknown notation: {}".format(notation))
+    i, j, k, l, values = [np.ravel(a) for a in np.broadcast_arrays(i, j, k, l, values)]
+    # Only the last of symmetry-related elements is kept, which guarantees a symmetric
+    # result, as if the elements were assigned one by one.
+    positions, select = _unique_last(PackedFourIndex.index(i, j, k, l))
+    if isinstance(four_index_object, PackedFourIndex):
+        # pylint: disable=protected-access
+        four_index_object._store(positions, values[select])
+    else:
+        set_four_index_element(four_index_object, i[select], j[select], k[select], l[select],
+                               values[select])
+
+
 def volume(cellvecs: np.ndarray) -> float:
     """Calculate the (generalized) cell volume.
 